@@ -0,0 +1,236 @@
+"""
+Exhaustive verification and throughput benchmark for the hand evaluators.
+
+Every engine is run over all 2,598,960 five-card hands under each of the
+13 wild card values that Deck.update_wild_card can produce. Each score is
+checked against the Counter-based Dealer.evaluate_possible_hand, memoized
+on its own key (reference_key) rather than the HandCache one under test.
+Hands are taken in chunks, each scored under every wild value, so a run
+cut short by the time budget still samples all of them; it then reports
+INCOMPLETE and fails like a mismatch.
+
+    python -m core.benchmark --budget 1200
+    python -m core.benchmark --engines table,vectorized --wild A,K
+"""
+
+import argparse
+import logging
+import time
+from array import array
+from collections import Counter
+from itertools import combinations, islice
+
+from viuda_card_config import REVERSE_VALUE_DICT
+
+from .card import CARDS
+from .dealer import Dealer
+from .evaluator import SCORE_SHIFT, HandRank, TableEvaluator, legacy_score
+from .hand_state import HandState
+
+TOTAL_HANDS = 2598960
+CHUNK_SIZE = 50000
+ENGINES = ("table", "memoized", "hand_state", "vectorized")
+
+
+def wild_card_values():
+    """The wild card values Deck.update_wild_card cycles through."""
+    return [REVERSE_VALUE_DICT[number] for number in range(1, 14)]
+
+
+def bench_cards():
+    """The 52 cards ordered by their card code (see core.encoding)."""
+    return list(CARDS)
+
+
+def reference_key(hand):
+    """
+    Sorted values and sorted suit counts: everything the Counter-based
+    reference reads from a hand. Deliberately not HandCache.canonical_key,
+    so a canonicalization bug cannot hide on both sides of the check.
+    """
+    values = tuple(sorted(card.code >> 2 for card in hand))
+    suits = tuple(sorted(Counter(card.suit for card in hand).values()))
+    return values, suits
+
+
+def hand_chunks():
+    """Yield (offset, list of code tuples) covering every 5-card hand."""
+    hands = combinations(range(52), 5)
+    offset = 0
+    while True:
+        chunk = list(islice(hands, CHUNK_SIZE))
+        if not chunk:
+            return
+        yield offset, chunk
+        offset += len(chunk)
+
+
+class EngineStats:
+    def __init__(self):
+        self.hands_done = 0
+        self.scoring_time = 0.0
+        self.mismatches = 0
+        self.histogram = Counter()
+
+
+class EvaluatorBenchmark:
+    def __init__(self, engines, wild_values, budget):
+        self.engines = engines
+        self.wild_values = wild_values
+        self.budget = budget
+
+        # The reference is the Counter-based path, called without the
+        # HandCache and memoized on reference_key instead.
+        self.reference = Dealer(None, [], None, None, None, 1, 1, None)
+        self.reference.hand_evaluator = None
+        self.reference_scores = {}  # (wild value, reference_key) -> score
+        self.reference_time = 0.0
+
+        self.table = TableEvaluator()
+        self.memoized = Dealer(None, [], None, None, None, 1, 1, None)
+        self.batch = None
+        if "vectorized" in engines:
+            from .batch_evaluator import BatchEvaluator
+
+            self.batch = BatchEvaluator()
+
+    def reference_chunk(self, wild_card_value, hands, keys):
+        """Reference scores for hands, whose reference_key()s are keys."""
+        started = time.perf_counter()
+        self.reference.wild.set_value(wild_card_value)
+        evaluate = self.reference.eval_hand_uncached
+        memo = self.reference_scores
+        scores = array("i")
+        for hand, hand_key in zip(hands, keys):
+            key = (wild_card_value, hand_key)
+            score = memo.get(key)
+            if score is None:
+                score = memo[key] = legacy_score(evaluate(hand))
+            scores.append(score)
+        self.reference_time += time.perf_counter() - started
+        return scores
+
+    def score_chunk(self, engine, wild_card_value, codes, hands):
+        if engine == "table":
+            evaluate = self.table.evaluate
+            return [evaluate(hand, wild_card_value) for hand in hands]
+        if engine == "memoized":
+            self.memoized.wild.set_value(wild_card_value)
+            score_hand = self.memoized.score_hand
+            return [score_hand(hand) for hand in hands]
+        if engine == "hand_state":
+            return [
+                HandState(hand, wild_card_value=wild_card_value).best_score()
+                for hand in hands
+            ]
+        if engine == "vectorized":
+            return self.batch.evaluate(codes, wild_card_value).tolist()
+        raise ValueError(f"Unknown engine: {engine}")
+
+    def check_chunk(self, engine, stats, wild_card_value, chunk, hands, expected):
+        chunk_started = time.perf_counter()
+        scores = self.score_chunk(engine, wild_card_value, chunk, hands)
+        stats.scoring_time += time.perf_counter() - chunk_started
+
+        for index, score in enumerate(scores):
+            if score != expected[index]:
+                stats.mismatches += 1
+                if stats.mismatches <= 10:
+                    logging.error(
+                        f"{engine}: {hands[index]} scored {score:#x}, "
+                        f"reference {expected[index]:#x}"
+                    )
+        stats.histogram.update(score >> SCORE_SHIFT for score in scores)
+        stats.hands_done += len(scores)
+
+    def run_chunks(self, all_stats):
+        """
+        Score chunk after chunk under every wild value, with the reference
+        and then every engine, until the budget is used up.
+        """
+        started = time.perf_counter()
+        cards = bench_cards()
+        for offset, chunk in hand_chunks():
+            hands = [[cards[code] for code in hand] for hand in chunk]
+            keys = [reference_key(hand) for hand in hands]
+            for wild_card_value in self.wild_values:
+                if time.perf_counter() - started > self.budget:
+                    return
+                expected = self.reference_chunk(wild_card_value, hands, keys)
+                for engine in self.engines:
+                    self.check_chunk(
+                        engine,
+                        all_stats[engine],
+                        wild_card_value,
+                        chunk,
+                        hands,
+                        expected,
+                    )
+
+    def run(self):
+        total = TOTAL_HANDS * len(self.wild_values)
+        all_stats = {engine: EngineStats() for engine in self.engines}
+        self.run_chunks(all_stats)
+        all_matched = True
+
+        for engine, stats in all_stats.items():
+            hands_done = stats.hands_done
+            rate = hands_done / stats.scoring_time if stats.scoring_time else 0.0
+            print(f"\n=== {engine} ===")
+            print(
+                f"Hands: {hands_done:,} of {total:,} ({100.0 * hands_done / total:.1f}%)"
+            )
+            print(f"Throughput: {rate:,.0f} hands/second")
+            print(f"Mismatches against reference: {stats.mismatches:,}")
+            for rank in sorted(HandRank, reverse=True):
+                count = stats.histogram.get(rank, 0)
+                share = 100.0 * count / hands_done if hands_done else 0.0
+                print(f"  {rank.name:<16} {count:>12,} {share:8.4f}%")
+            if stats.mismatches:
+                all_matched = False
+            if hands_done < total:
+                print(f"INCOMPLETE: {total - hands_done:,} hands not checked")
+                all_matched = False
+
+        print(
+            f"\nReference: {self.reference_time:.1f}s of the {self.budget:g}s budget, "
+            f"{len(self.reference_scores):,} distinct hands scored"
+        )
+        if "memoized" in self.engines:
+            print(f"Memoized cache: {self.memoized.hand_cache.stats()}")
+        return all_matched
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument(
+        "--budget",
+        type=float,
+        default=1200.0,
+        help="total wall-clock seconds, reference included",
+    )
+    parser.add_argument(
+        "--engines",
+        default=",".join(ENGINES),
+        help=f"comma-separated engines to run ({', '.join(ENGINES)})",
+    )
+    parser.add_argument(
+        "--wild",
+        default=",".join(wild_card_values()),
+        help="comma-separated wild card values to enumerate",
+    )
+    args = parser.parse_args()
+
+    engines = [engine for engine in args.engines.split(",") if engine]
+    for engine in engines:
+        if engine not in ENGINES:
+            parser.error(f"unknown engine: {engine}")
+    wild_values = [value for value in args.wild.split(",") if value]
+
+    benchmark = EvaluatorBenchmark(engines, wild_values, args.budget)
+    if not benchmark.run():
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,55 @@
+"""
+The bot protocol: what a seat sees (Observation) and what plays it (Bot).
+
+Kept apart from core.bots, which imports every strategy for its BOTS
+registry, so strategies in their own modules can subclass Bot.
+"""
+
+import random
+from collections import namedtuple
+
+# Seats are 0-based. reveal_cards is empty while they are face down.
+Observation = namedtuple(
+    "Observation",
+    "seat phase hand reveal_cards revealed wild_value chips statuses "
+    "table_chips side_chips call_made calling_player turns_after_call "
+    "consecutive_passes legal_actions",
+)
+
+
+def observe(game):
+    """What the seat to act (or the side chip decision) sees of game."""
+    seat = game.current_player
+    return Observation(
+        seat=seat,
+        phase=game.phase,
+        hand=tuple(game.hands[seat]),
+        reveal_cards=tuple(game.reveal_cards) if game.revealed else (),
+        revealed=game.revealed,
+        wild_value=game.wild.value,
+        chips=tuple(game.chips),
+        statuses=tuple(game.statuses),
+        table_chips=game.table_chips,
+        side_chips=game.side_chips,
+        call_made=game.call_made,
+        calling_player=game.calling_player,
+        turns_after_call=game.turns_after_call,
+        consecutive_passes=game.consecutive_passes,
+        legal_actions=game.legal_actions(),
+    )
+
+
+class Bot:
+    """Base class for strategies. Subclasses implement choose()."""
+
+    name = "bot"
+
+    def __init__(self, seed=None):
+        self.rng = random.Random(seed)
+
+    def choose(self, observation, deadline):
+        """
+        Return one of observation.legal_actions. deadline is the
+        time.perf_counter() value the answer is due by.
+        """
+        raise NotImplementedError
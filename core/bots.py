@@ -0,0 +1,218 @@
+"""
+Bot players: strategies that pick a seat's actions from what it can see.
+
+A bot gets an Observation, an immutable snapshot of the game from one
+seat: its own hand, the reveal cards once they are face up, the wild card
+value, the chips and the call state, plus the legal actions. It returns
+one of those actions (core.game) before a deadline:
+
+    class AlwaysPass(Bot):
+        def choose(self, observation, deadline):
+            return PASS_ACTION
+
+Bot, Observation and observe() live in core.bot_base, so strategies in
+their own modules (core.ismcts, core.strategy_table) can subclass Bot;
+they are re-exported here.
+
+TimedBot asks a bot for its decision and enforces the time budget. A late,
+illegal or failing answer is replaced by fallback_action(), so a bad bot
+cannot stall a table. The same TimedBot plays a seat in the game windows
+(GameWindow(bots=...)) and in headless simulations (core.simulate).
+"""
+
+import logging
+import time
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+
+from .bot_base import Bot, Observation, observe
+from .exchange_solver import PASS, best_exchange
+from .game import (
+    CALL_ACTION,
+    PASS_ACTION,
+    REVEAL_ACTION,
+    SIDE_CHIP,
+    TAKE_SIDE_CHIP_ACTION,
+    Action,
+)
+from .ismcts import ISMCTSBot
+from .strategy_table import TableBot
+
+DEFAULT_BUDGET = 1.0  # Seconds per decision
+# Slack after the deadline for a bot that stops as soon as it is reached.
+TIMEOUT_GRACE = 0.005
+
+Decision = namedtuple("Decision", "action elapsed timed_out")
+
+
+def fallback_action(observation):
+    """What a bot that did not answer plays: pass, or take the side chip."""
+    if observation.phase == SIDE_CHIP:
+        return TAKE_SIDE_CHIP_ACTION
+    return PASS_ACTION
+
+
+class RandomBot(Bot):
+    """Any legal action, uniformly; always takes the side chip."""
+
+    name = "random"
+
+    def choose(self, observation, deadline):
+        if observation.phase == SIDE_CHIP:
+            return TAKE_SIDE_CHIP_ACTION
+        return self.rng.choice(observation.legal_actions)
+
+
+class GreedyBot(Bot):
+    """
+    Reveal when the reveal cards are down, then play the best exchange.
+    With nothing to improve, call if nobody has yet, otherwise pass.
+    """
+
+    name = "greedy"
+
+    def choose(self, observation, deadline):
+        if observation.phase == SIDE_CHIP:
+            return TAKE_SIDE_CHIP_ACTION
+        if not observation.revealed:
+            return REVEAL_ACTION
+        move = best_exchange(
+            observation.hand, observation.reveal_cards, observation.wild_value
+        )
+        if move.kind != PASS:
+            return Action(move.kind, move.hand_index, move.reveal_index)
+        return PASS_ACTION if observation.call_made else CALL_ACTION
+
+
+BOTS = {bot.name: bot for bot in (GreedyBot, ISMCTSBot, RandomBot, TableBot)}
+
+
+def make_bot(name, seed=None):
+    try:
+        return BOTS[name](seed=seed)
+    except KeyError:
+        raise ValueError(f"Unknown bot: {name}") from None
+
+
+class TimedBot:
+    """
+    Asks bot for decisions within budget seconds each.
+
+    Inline (the default) the bot runs on the caller's thread and a late
+    answer is discarded: cheap enough for simulations, but a bot that never
+    returns blocks its caller. threaded=True runs the bot on its own worker
+    thread. decide() then stops waiting at the deadline, and submit()
+    returns at once so an event loop can poll for the answer; while a
+    timed-out call is still running, every decision falls back at once.
+    """
+
+    def __init__(self, bot, budget=DEFAULT_BUDGET, threaded=False):
+        self.bot = bot
+        self.budget = budget
+        self.threaded = threaded
+        self.executor = None
+        self.pending = None
+        self.decisions = 0
+        self.timeouts = 0
+        self.total_time = 0.0
+
+    @property
+    def name(self):
+        return self.bot.name
+
+    def decide(self, observation):
+        if self.threaded:
+            pending = self.submit(observation)
+            pending.wait()
+            return pending.result()
+        start = time.perf_counter()
+        try:
+            action = self.bot.choose(observation, start + self.budget)
+        except Exception as e:
+            logging.error(f"Bot {self.name} failed: {e}")
+            action = None
+        return self.finish(observation, action, time.perf_counter() - start, False)
+
+    def submit(self, observation):
+        """Start a decision on the worker thread; returns a PendingDecision."""
+        start = time.perf_counter()
+        deadline = start + self.budget
+        if self.pending is not None and not self.pending.done():
+            # Still busy with a decision it has already run out of time on.
+            return PendingDecision(self, observation, start, deadline, None)
+        if self.executor is None:
+            self.executor = ThreadPoolExecutor(
+                max_workers=1, thread_name_prefix=f"bot-{self.name}"
+            )
+        self.pending = self.executor.submit(self.timed_choose, observation, deadline)
+        return PendingDecision(self, observation, start, deadline, self.pending)
+
+    def timed_choose(self, observation, deadline):
+        """Runs on the worker thread: the action and when it was chosen."""
+        return self.bot.choose(observation, deadline), time.perf_counter()
+
+    def finish(self, observation, action, elapsed, timed_out):
+        """Count the decision and replace a late or illegal action."""
+        if timed_out or elapsed > self.budget + TIMEOUT_GRACE:
+            timed_out = True
+            self.timeouts += 1
+            action = fallback_action(observation)
+        elif action not in observation.legal_actions:
+            if action is not None:
+                logging.warning(f"Bot {self.name} chose illegal action {action}")
+            action = fallback_action(observation)
+        self.decisions += 1
+        self.total_time += elapsed
+        return Decision(action, elapsed, timed_out)
+
+    def mean_time(self):
+        return self.total_time / self.decisions if self.decisions else 0.0
+
+    def close(self):
+        if self.executor is not None:
+            self.executor.shutdown(wait=False, cancel_futures=True)
+            self.executor = None
+
+
+class PendingDecision:
+    """
+    A decision running on a threaded TimedBot's worker. It is ready once the
+    bot has answered or the deadline (plus TIMEOUT_GRACE) has passed;
+    result() then gives the Decision, a fallback if the bot was late.
+    """
+
+    def __init__(self, timed_bot, observation, start, deadline, future):
+        self.timed_bot = timed_bot
+        self.observation = observation
+        self.start = start
+        self.deadline = deadline
+        self.future = future  # None when the bot is still busy and falls back
+
+    def ready(self):
+        return (
+            self.future is None
+            or self.future.done()
+            or time.perf_counter() > self.deadline + TIMEOUT_GRACE
+        )
+
+    def wait(self):
+        """Block until ready()."""
+        if self.future is None:
+            return
+        timeout = self.deadline + TIMEOUT_GRACE - time.perf_counter()
+        try:
+            self.future.result(timeout=max(0.0, timeout))
+        except Exception:
+            pass  # Timed out, or the bot failed: result() reports either
+
+    def result(self):
+        action = None
+        elapsed = time.perf_counter() - self.start
+        timed_out = self.future is None or not self.future.done()
+        if not timed_out:
+            try:
+                action, chosen = self.future.result()
+                elapsed = chosen - self.start
+            except Exception as e:
+                logging.error(f"Bot {self.timed_bot.name} failed: {e}")
+        return self.timed_bot.finish(self.observation, action, elapsed, timed_out)
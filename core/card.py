@@ -1,104 +1,136 @@
-import os
 import random
 import logging
-from PyQt5.QtCore import Qt
-from PyQt5.QtGui import QPixmap, QPainter, QPen
 from viuda_card_config import CARD_VALUES, CARD_SUITS, VALUE_DICT
+from .encoding import encode_card
+from .wild import WildContext, wild_card_number
 
 
 class Card:
-    def __init__(self, value, suit, is_wild=False):
+    """
+    One of the 52 card identities: value, suit, id ("AS") and code.
+
+    Cards are interned: Card("A", "S") always returns the same immutable
+    instance, built once per process, and card_for_id() / card_for_code()
+    look one up without building anything. Which way up a card lies is
+    kept by its card widget, and whether it is wild by the game's
+    WildContext, so the same card can be shared by every deck and window.
+    Images for a card come from ui.card_pixmap.
+    """
+
+    __slots__ = ("value", "suit", "id", "code")
+
+    def __new__(cls, value, suit):
+        card = CARDS_BY_ID.get(f"{value}{suit}")
+        if card is not None:
+            return card
         if value not in CARD_VALUES:
             raise ValueError(f"Invalid card value: {value}")
         if suit not in CARD_SUITS:
             raise ValueError(f"Invalid card suit: {suit}")
-        self.value = value
-        self.suit = suit
-        self.is_wild = is_wild  # Initialize with the given wild status
-        self.face_up = False
-        self.id = f"{self.value}{self.suit}"
-        self.pixmap = QPixmap()  # Initialize pixmap
-        self.load_image()
+        card = super().__new__(cls)
+        object.__setattr__(card, "value", value)
+        object.__setattr__(card, "suit", suit)
+        object.__setattr__(card, "id", f"{value}{suit}")
+        object.__setattr__(card, "code", encode_card(value, suit))
+        CARDS_BY_ID[card.id] = card
+        return card
+
+    def __setattr__(self, name, value):
+        raise AttributeError("Card is immutable")
+
+    def __reduce__(self):
+        # Unpickling goes through Card(), so it returns the interned card.
+        return Card, (self.value, self.suit)
 
     def __str__(self):
-        return f"{self.value} of {self.suit}" + (" (Wild)" if self.is_wild else "")
+        return f"{self.value} of {self.suit}"
 
     def __repr__(self):
         return f"{self.value}{self.suit}"
 
-    # wild card ===================
-    def load_image(self):
-        """Load the image for the card and add a red border if it's a wild card."""
-        img_path = os.path.join("graphics/cards", f"{self.id}.png")
-        self.pixmap = QPixmap(img_path)
-        if self.is_wild:
-            self.add_red_border()
-            # print(f"Card: load_image - Red border added to wild card: {self.id}")
-
-    def add_red_border(self):
-        if not self.pixmap.isNull():
-            painter = QPainter(self.pixmap)
-            pen = QPen(Qt.red, 5)
-            painter.setPen(pen)
-            painter.drawRect(0, 0, self.pixmap.width() - 1, self.pixmap.height() - 1)
-            painter.end()
-
-    def highlight_wild_card(self, card_label, is_face_up):
-        if card_label is not None and hasattr(card_label, "card"):
-            if card_label.card.is_wild and is_face_up:
-                card_label.setStyleSheet("border: 2px solid red;")
-            else:
-                card_label.setStyleSheet("")  # Clear the border style
-        else:
-            pass
-            # print(f"Card: highlight_wild_card - Card label is None or does not have a 'card' attribute: {card_label}")
-
-    def set_wild(self, is_wild):
-        self.is_wild = is_wild
-        # self.load_image()
-        if self.is_wild:
-            pass
-            # print(f"Card: set_wild - Card {self.id} is wild and should be highlighted.")
-        else:
-            pass
-            # print(f"Card {self.id} is not wild.")
 
-    # END ============================
+CARDS_BY_ID = {}
+# Indexed by card code (see core.encoding).
+CARDS = tuple(
+    sorted(
+        (Card(value, suit) for value in CARD_VALUES for suit in CARD_SUITS),
+        key=lambda card: card.code,
+    )
+)
+
 
-    def set_face_down(self):
-        self.face_up = False
-        self.pixmap = QPixmap("graphics/cards/default.png")
+def card_for_id(card_id):
+    """The interned card for an id such as "AS"."""
+    try:
+        return CARDS_BY_ID[card_id]
+    except KeyError:
+        raise ValueError(f"Invalid card id: {card_id}") from None
 
-    def set_face_up(self):
-        self.face_up = True
-        self.load_image()
 
-    def get_pixmap(self):
-        return self.pixmap
+def card_for_code(code):
+    """The interned card for a card code (0-51)."""
+    return CARDS[code]
+
+
+def cards_for_codes(codes):
+    """Cards for any iterable of codes, such as a row dealt by core.shoe."""
+    return [CARDS[code] for code in codes]
 
 
 class Deck:
-    def __init__(self):
+    """
+    One or more 52-card decks dealt in order from a shuffled list.
+
+    Each deck has its own random.Random, so a seed makes every shuffle and
+    deal reproducible without touching the global random state. Dealing
+    moves a position along self.cards instead of popping, and shuffle()
+    gathers every card back, so one Deck lasts a whole game.
+    """
+
+    def __init__(self, wild=None, seed=None, decks=1):
+        self.decks = decks
+        self.rng = random.Random(seed)
         self.cards = self.create_deck()
+        self.position = 0
         self.value_dict = VALUE_DICT  # Use the common value dictionary
-        self.wild_card_value = None
+        # Shared with the dealer and widgets; a new deck keeps the game's context.
+        self.wild = wild if wild is not None else WildContext()
+
+    @property
+    def wild_card_value(self):
+        return self.wild.value
 
     def create_deck(self):
-        return [Card(value, suit) for suit in CARD_SUITS for value in CARD_VALUES]
+        return [
+            Card(value, suit)
+            for _ in range(self.decks)
+            for suit in CARD_SUITS
+            for value in CARD_VALUES
+        ]
 
     def shuffle(self):
-        logging.info("Deck shuffling the deck...")
-        random.shuffle(self.cards)
-        print("Deck: shuffled.")
+        """Put every card back and shuffle the whole deck."""
+        self.rng.shuffle(self.cards)
+        self.position = 0
+        logging.info(f"Deck: shuffled {len(self.cards)} cards.")
 
     def deal(self, num_cards):
-        if len(self.cards) < num_cards:
+        if self.remaining_cards() < num_cards:
             raise ValueError("Not enough cards in the deck to deal.")
-        dealt_cards = [self.cards.pop() for _ in range(num_cards)]
+        dealt_cards = self.cards[self.position : self.position + num_cards]
+        self.position += num_cards
         return dealt_cards
 
+    def deal_hands(self, num_hands, hand_size=5):
+        """Deal num_hands hands of hand_size cards, in turn from the top."""
+        dealt_cards = self.deal(num_hands * hand_size)
+        return [
+            dealt_cards[start : start + hand_size]
+            for start in range(0, len(dealt_cards), hand_size)
+        ]
+
     def remaining_cards(self):
-        return len(self.cards)
+        return len(self.cards) - self.position
 
     def update_wild_card1(self, table_chips):
         wild_card_value_number = table_chips
@@ -109,7 +141,7 @@ class Deck:
         ]
         if matching_values:
             wild_card_value = matching_values[0]
-            self.wild_card_value = wild_card_value
+            self.wild.set_value(wild_card_value)
             print(
                 f"Deck: update_wild_card - Wild card updated to {self.wild_card_value}"
             )
@@ -118,38 +150,17 @@ class Deck:
                 f"Deck: update_wild_card - No matching wild card value found for table_chips = {table_chips}"
             )
 
-        # Update card states
-        for card in self.cards:
-            card.set_wild(card.value == self.wild_card_value)
-
     def update_wild_card(self, table_chips):
-        # Import the new dictionary
-        from viuda_card_config import REVERSE_VALUE_DICT
-
-        # --- NEW, CORRECTED LOGIC ---
-        # The wild card number cycles from 1 to 13.
-        # The modulo operator (%) is perfect for this.
-        # (table_chips - 1) % 13 ensures the result is always 0-12.
-        # Adding +1 makes it 1-13.
-        wild_card_number = ((table_chips - 1) % 13) + 1
-
-        # Look up the card's string value (e.g., 'A', 'K', '8') using the number
-        self.wild_card_value = REVERSE_VALUE_DICT.get(wild_card_number)
-        # --- END OF NEW LOGIC ---
-
-        if self.wild_card_value:
-            print(
-                f"Deck: update_wild_card - Wild card value is now '{self.wild_card_value}'"
-            )
-            # Update the is_wild status for all cards in the deck
-            for card in self.cards:
-                card.set_wild(card.value == self.wild_card_value)
-        else:
-            print(
-                f"Deck: update_wild_card - Error: Could not find a wild card for number {wild_card_number}"
-            )
+        # The wild card number cycles from 1 to 13 (see core.wild). Only
+        # the shared context changes; cards are never touched.
+        self.wild.update_from_table_chips(table_chips)
+        print(
+            f"Deck: update_wild_card - Wild card value is now '{self.wild_card_value}' "
+            f"(number {wild_card_number(table_chips)})"
+        )
 
     def draw_card(self):
-        if not self.cards:
+        if not self.remaining_cards():
             raise ValueError("No cards left in the deck")
-        return self.cards.pop()
+        self.position += 1
+        return self.cards[self.position - 1]
@@ -1,7 +1,6 @@
 import logging
 import random
 from collections import Counter
-from enum import IntEnum
 from itertools import combinations_with_replacement
 
 from PyQt5.QtCore import QObject, pyqtSignal
@@ -9,19 +8,16 @@ from PyQt5.QtWidgets import QMessageBox
 
 from viuda_card_config import VALUE_DICT
 from .card import Card  # <-- This imports the Card class from the same folder
-
-
-class HandRank(IntEnum):
-    HIGH_CARD = 1
-    ONE_PAIR = 2
-    TWO_PAIR = 3
-    THREE_OF_A_KIND = 4
-    STRAIGHT = 5
-    FLUSH = 6
-    FULL_HOUSE = 7
-    POKER = 8
-    REPOKER = 9
-    STRAIGHT_FLUSH = 10
+from .evaluator import (
+    HandRank,
+    TableEvaluator,
+    describe_score,
+    legacy_score,
+    score_rank,
+)
+from .hand_cache import HandCache
+from .showdown import showdown
+from .wild import WildContext, wild_card_number
 
 
 class Dealer(QObject):
@@ -39,6 +35,7 @@ class Dealer(QObject):
         table_chips,
         side_chips,
         deck,
+        hand_cache_size=4096,
     ):
         super().__init__()
         self.game_window = game_window
@@ -60,9 +57,48 @@ class Dealer(QObject):
         # self.side_chips = 1
         self.table_chip_label = table_chip_label
         self.side_chip_label = side_chip_label
-        self.wild_card_value = None
 
+        # The game's wild card value. Replaced by the deck's context in
+        # attach_deck, so deck, dealer and widgets all read the same one.
+        self.wild = WildContext()
+        self.deck = deck
+
+        # Canonical-hand LRU in front of eval_hand. It is flushed whenever
+        # the wild card value rotates or the engine below is replaced.
+        self.hand_cache = HandCache(hand_cache_size)
+
+        # Engine used by eval_hand. Set to None to fall back to the
+        # Counter-based evaluate_possible_hand below.
+        self.hand_evaluator = TableEvaluator()
+        self.wild.add_listener(self.on_wild_card_changed)
+        if deck is not None:
+            self.attach_deck(deck)
+
+    def attach_deck(self, deck):
+        """Use a new deck and share its WildContext."""
         self.deck = deck
+        if deck.wild is not self.wild:
+            self.wild = deck.wild
+            self.wild.add_listener(self.on_wild_card_changed)
+        self.hand_cache.invalidate(self.wild.value)
+
+    @property
+    def wild_card_value(self):
+        return self.wild.value
+
+    @property
+    def hand_evaluator(self):
+        return self._hand_evaluator
+
+    @hand_evaluator.setter
+    def hand_evaluator(self, evaluator):
+        # Each engine caches its own result format: (rank, score) from the
+        # table evaluator, the Counter-path tuple without one.
+        self._hand_evaluator = evaluator
+        self.hand_cache.clear()
+
+    def on_wild_card_changed(self, old_value, new_value):
+        self.hand_cache.invalidate(new_value)
 
     def eval_hand1(self, hand):
         logging.info("Dealer Evaluating hand rank")
@@ -72,7 +108,7 @@ class Dealer(QObject):
         wildcards = []
 
         for card in hand:
-            if card.is_wild:
+            if self.wild.is_wild(card):
                 wildcards.append(
                     card.value
                 )  # Assuming card.value is a placeholder for wildcards
@@ -105,7 +141,14 @@ class Dealer(QObject):
         return best_hand
 
     def eval_hand(self, hand):
+        return self.hand_cache.lookup(hand, self.eval_hand_uncached)
+
+    def eval_hand_uncached(self, hand):
         logging.info("Dealer Evaluating hand rank")
+        if self.hand_evaluator is not None:
+            score = self.hand_evaluator.evaluate(hand, self.wild.value)
+            return score_rank(score), score
+
         value_map = self.value_dict
         values = []
         suits = []
@@ -113,8 +156,8 @@ class Dealer(QObject):
 
         # --- NEW, CORRECTED LOGIC ---
         for card in hand:
-            # A card is a wildcard IF AND ONLY IF its is_wild flag is True.
-            if card.is_wild:
+            # A card is a wildcard IF AND ONLY IF it has the wild card value.
+            if self.wild.is_wild(card):
                 # We add a placeholder value for wildcards, e.g., 0.
                 # Its real value will be determined later.
                 wildcards.append(0)
@@ -125,7 +168,7 @@ class Dealer(QObject):
             suits.append(card.suit)
         # --- END OF NEW LOGIC ---
 
-        print(
+        logging.debug(
             f"Dealer: eval_hand - Hand values: {values}, suits: {suits}, wildcards: {wildcards}"
         )
 
@@ -148,6 +191,13 @@ class Dealer(QObject):
 
         return best_hand
 
+    def score_hand(self, hand):
+        """Return the hand's strength as one packed integer (see core.evaluator)."""
+        hand_eval = self.eval_hand(hand)
+        if self.hand_evaluator is not None:
+            return hand_eval[1]
+        return legacy_score(hand_eval)
+
     def get_all_wildcard_combinations(self, wildcards, possible_values):
         from itertools import combinations_with_replacement
 
@@ -168,7 +218,7 @@ class Dealer(QObject):
 
         if is_straight and is_flush:
             return HandRank.STRAIGHT_FLUSH, values
-        elif most_common[0][1] == 4 and len(set(values)) == 4 and len(wildcards) == 1:
+        elif most_common[0][1] == 5:
             return HandRank.REPOKER, most_common
         elif poker_result:
             return poker_result
@@ -213,44 +263,21 @@ class Dealer(QObject):
     # END hand evaluation ===========================
 
     def set_wild_card(self, card_value):
-        for player_window in self.player_windows:
-            for card_label in player_window.cards:
-                card = card_label.card
-                card.set_wild(card.value == card_value)
-                card_label.setPixmap(card.pixmap)
+        # WildContext listeners repaint whichever cards flipped.
+        self.wild.set_value(card_value)
 
     def update_wild_card_value(self):
-        wild_card_value_number = self.table_chips % 13 + 1
-        matching_values = [
-            key
-            for key, value in self.value_dict.items()
-            if value == wild_card_value_number
-        ]
-        if matching_values:
-            wild_card_value = matching_values[0]
-            self.wild_card_value = wild_card_value
-            print(
-                f"Dealer: update_wild_card_value - Wild card updated to {self.wild_card_value}"
-            )
-        else:
-            print(
-                f"Dealer: update_wild_card_value - No matching wild card value found for table_chips = {self.table_chips}"
-            )
-
-        # Update card states
-        for player_window in self.player_windows:
-            for card in player_window.cards:
-                card.set_wild(self.is_wild_card(card))
-                card_label = player_window.find_card_label(card)
-                if card_label:
-                    card_label.setPixmap(card.get_pixmap())
+        self.wild.update_from_table_chips(self.table_chips)
+        print(
+            f"Dealer: update_wild_card_value - Wild card updated to {self.wild_card_value}"
+        )
 
     def determine_wild_card(self):
-        wild_card_value = self.table_chips % 13 + 1
-        return wild_card_value
+        # Same numbering as Deck.update_wild_card (1 is the ace).
+        return wild_card_number(self.table_chips)
 
     def is_wild_card(self, card):
-        return card.value == str(self.determine_wild_card())
+        return self.wild.is_wild(card)
 
     # END ===============================
 
@@ -282,25 +309,25 @@ class Dealer(QObject):
         Evaluates hands for all players and returns the winning and losing windows.
         This method does NOT handle any UI updates.
         """
-        all_hands = []
-        for window in player_windows:
-            player_cards = [item.card for item in window.player_dragwidget.items]
-            all_hands.append((window, player_cards))
-
-        evaluated_hands = []
-        for window, cards in all_hands:
-            hand_eval = self.eval_hand(cards)
-            evaluated_hands.append((window, hand_eval, cards))  # Also return the cards
-
-        evaluated_hands.sort(key=lambda x: x[1], reverse=True)
+        hands = [
+            [item.card for item in window.player_dragwidget.items]
+            for window in player_windows
+        ]
+        # Only hands that can still be best or worst get fully scored.
+        result = showdown(hands, self.score_hand, self.wild.value)
 
-        winning_window, winning_hand, winning_cards = evaluated_hands[0]
-        losing_window, losing_hand, losing_cards = evaluated_hands[-1]
+        winning_window = player_windows[result.winner]
+        losing_window = player_windows[result.loser]
+        winning_cards = hands[result.winner]
+        winning_score = result.scores[result.winner]
+        losing_score = result.scores[result.loser]
 
         print(
-            f"Winner: Player {winning_window.player_number} with hand: {winning_hand}"
+            f"Winner: Player {winning_window.player_number} with hand: {describe_score(winning_score)}"
+        )
+        print(
+            f"Loser: Player {losing_window.player_number} with hand: {describe_score(losing_score)}"
         )
-        print(f"Loser: Player {losing_window.player_number} with hand: {losing_hand}")
 
         # Return the actual window objects and their cards
         return winning_window, losing_window, winning_cards
@@ -312,27 +339,6 @@ class Dealer(QObject):
 
     # END Winner & Losser ==========
 
-    def update_side_chips(self, amount, game_window):
-        print(
-            f"D1-3 update_side_chips - Update side chips by {amount}. Current side chips: {self.side_chips}"
-        )
-        self.side_chips += amount
-
-        if self.side_chips < 0:
-            self.side_chips = 0
-
-        print(f"D2-3 update_side_chips - New side chips count: {self.side_chips}")
-
-        # Update the side chip label in the GameWindow
-        game_window.update_side_chip_label()
-
-        # Emit signal if side chips have been updated
-        self.side_chip_label_updated.emit(self.side_chips)
-
-        # If no side chips are left, remove the side chip label
-        if self.side_chips == 0:
-            game_window.remove_side_chip_label()
-
     def update_side_chip_labelOriginal(self, game_window):
         """Update the side chips label via the GameWindow."""
         game_window.update_side_chip_label()
@@ -341,25 +347,6 @@ class Dealer(QObject):
         """Updates the side chip label in the GameWindow."""
         self.side_chip_label.setText(f"Side Chips: {self.side_chips}")
 
-    def update_player_chips(self, player_index, amount):
-        print(
-            f"D1-3 update_player_chips - Updating player chips for player index: {player_index} with amount: {amount}"
-        )
-        if 0 <= player_index < len(self.player_windows):
-            self.player_windows[player_index].player_chips += amount
-            if self.player_windows[player_index].player_chips < 0:
-                self.player_windows[player_index].player_chips = 0
-            print(
-                f"D2-3 update_player_chips - New chips count for player index {player_index}: {self.player_windows[player_index].player_chips}"
-            )
-            self.player_chips_updated.emit(
-                player_index, self.player_windows[player_index].player_chips
-            )
-        else:
-            print(
-                f"D3-3 update_player_chips - Invalid player index: {player_index} for updating chips."
-            )
-
     def check_for_winner(self):
         if len(self.player_windows) == 1:
             winner = self.player_windows[0]
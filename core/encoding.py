@@ -0,0 +1,141 @@
+"""
+The compact card encoding shared by the engine, the UI and wire formats.
+
+A card is one 6-bit integer, value_index * 4 + suit_index, where
+value_index runs over CARD_VALUES ("2" = 0 ... "A" = 12) and suit_index
+over CARD_SUITS. The numeric card value used by the evaluators is
+value_index + 2. Card.code holds it, core.card.CARDS is indexed by it,
+and hands are stored as tuples of codes, 52-bit masks or 30-bit packed
+integers. The array versions take numpy arrays and import numpy only
+when called.
+"""
+
+import json
+
+from viuda_card_config import CARD_SUITS, CARD_VALUES
+
+CARD_COUNT = 52
+CODE_BITS = 6
+CODE_MASK = (1 << CODE_BITS) - 1
+
+VALUE_INDEX = {value: index for index, value in enumerate(CARD_VALUES)}
+SUIT_INDEX = {suit: index for index, suit in enumerate(CARD_SUITS)}
+
+# Indexed by card code.
+CARD_IDS = tuple(
+    f"{CARD_VALUES[code >> 2]}{CARD_SUITS[code & 3]}" for code in range(CARD_COUNT)
+)
+CODE_VALUES = tuple((code >> 2) + 2 for code in range(CARD_COUNT))
+CODE_FOR_ID = {card_id: code for code, card_id in enumerate(CARD_IDS)}
+
+
+def encode_card(value, suit):
+    return VALUE_INDEX[value] * 4 + SUIT_INDEX[suit]
+
+
+def decode_card(code):
+    """Return the (value, suit) strings for an encoded card."""
+    return CARD_VALUES[code >> 2], CARD_SUITS[code & 3]
+
+
+def code_for_id(card_id):
+    """The code of a card id such as "AS"."""
+    try:
+        return CODE_FOR_ID[card_id]
+    except KeyError:
+        raise ValueError(f"Invalid card id: {card_id}") from None
+
+
+def card_value(code):
+    """Numeric value (2-14) of an encoded card."""
+    return (code >> 2) + 2
+
+
+def encode_hand(cards):
+    """A hand of Card objects as a hashable tuple of codes."""
+    return tuple(card.code for card in cards)
+
+
+def hand_mask(codes):
+    """A hand as a 52-bit mask: equal for the same cards in any order."""
+    mask = 0
+    for code in codes:
+        mask |= 1 << code
+    return mask
+
+
+def pack_hand(codes):
+    """Pack up to 10 codes, first card in the low bits, into one integer."""
+    packed = 0
+    for code in reversed(codes):
+        packed = (packed << CODE_BITS) | code
+    return packed
+
+
+def unpack_hand(packed, size=5):
+    return tuple((packed >> (CODE_BITS * index)) & CODE_MASK for index in range(size))
+
+
+# Vectorized versions for batch work.
+
+
+def ids_to_codes(card_ids):
+    """Array of card ids ("AS", ...) of any shape to an int8 array of codes."""
+    import numpy as np
+
+    ids = np.asarray(card_ids)
+    lookup = np.asarray(sorted(CODE_FOR_ID))
+    codes = np.asarray([CODE_FOR_ID[card_id] for card_id in lookup], dtype=np.int8)
+    positions = np.searchsorted(lookup, ids)
+    positions = np.minimum(positions, len(lookup) - 1)
+    if not (lookup[positions] == ids).all():
+        raise ValueError("Invalid card id in array")
+    return codes[positions]
+
+
+def codes_to_ids(codes):
+    """Array of codes of any shape to an array of card id strings."""
+    import numpy as np
+
+    return np.asarray(CARD_IDS)[np.asarray(codes)]
+
+
+def codes_to_values(codes):
+    """Numeric card values (2-14) of an array of codes."""
+    import numpy as np
+
+    return (np.asarray(codes) >> 2) + 2
+
+
+def pack_hands(codes):
+    """Pack each row of an (N, size) code array into one int64."""
+    import numpy as np
+
+    codes = np.asarray(codes, dtype=np.int64)
+    shifts = np.arange(codes.shape[-1], dtype=np.int64) * CODE_BITS
+    return (codes << shifts).sum(axis=-1)
+
+
+def unpack_hands(packed, size=5):
+    """Inverse of pack_hands: an (N, size) int8 array of codes."""
+    import numpy as np
+
+    packed = np.asarray(packed, dtype=np.int64)
+    shifts = np.arange(size, dtype=np.int64) * CODE_BITS
+    return ((packed[..., None] >> shifts) & CODE_MASK).astype(np.int8)
+
+
+# Wire format for one card moving between widgets (the drag MIME text).
+
+
+def card_message(code, source_name):
+    return json.dumps({"code": code, "source_name": source_name})
+
+
+def read_card_message(text):
+    """Return (code, source_name) from card_message() text."""
+    message = json.loads(text)
+    code = message["code"]
+    if not isinstance(code, int) or not 0 <= code < CARD_COUNT:
+        raise ValueError(f"Invalid card code: {code!r}")
+    return code, message.get("source_name")
@@ -0,0 +1,364 @@
+import logging
+import os
+import pickle
+from collections import Counter
+from enum import IntEnum
+from itertools import combinations, combinations_with_replacement
+
+from viuda_card_config import CACHE_DIR, REVERSE_VALUE_DICT
+
+from .encoding import CODE_VALUES
+
+
+class HandRank(IntEnum):
+    HIGH_CARD = 1
+    ONE_PAIR = 2
+    TWO_PAIR = 3
+    THREE_OF_A_KIND = 4
+    STRAIGHT = 5
+    FLUSH = 6
+    FULL_HOUSE = 7
+    POKER = 8
+    REPOKER = 9
+    STRAIGHT_FLUSH = 10
+
+
+# A hand strength is a single integer: the HandRank in the high bits and the
+# five card values (ordered by group size, then by value) as 4-bit kickers.
+SCORE_SHIFT = 20
+KICKER_BITS = 4
+LEAD_SHIFT = SCORE_SHIFT - KICKER_BITS  # score >> LEAD_SHIFT is rank and lead value
+
+# One prime per card value, so the product of five primes identifies the
+# value multiset of a hand regardless of card order.
+VALUE_PRIMES = {
+    2: 2,
+    3: 3,
+    4: 5,
+    5: 7,
+    6: 11,
+    7: 13,
+    8: 17,
+    9: 19,
+    10: 23,
+    11: 29,
+    12: 31,
+    13: 37,
+    14: 41,
+}
+
+HAND_TABLE_VERSION = 2
+HAND_TABLE_PATH = os.path.join(CACHE_DIR, "hand_tables.pkl")
+
+
+def pack_score(rank, values):
+    """Pack a HandRank and five ordered card values into one integer."""
+    score = int(rank)
+    for value in values:
+        score = (score << KICKER_BITS) | value
+    return score
+
+
+def score_rank(score):
+    """Return the HandRank stored in the high bits of a packed score."""
+    return HandRank(score >> SCORE_SHIFT)
+
+
+def decode_score(score):
+    """Return the HandRank and the five ordered card values of a packed score."""
+    values = [(score >> (KICKER_BITS * shift)) & 0xF for shift in range(4, -1, -1)]
+    return score_rank(score), values
+
+
+def describe_score(score):
+    """Readable form of a packed score, e.g. 'Full House: K K K 7 7'."""
+    rank, values = decode_score(score)
+    rank_name = rank.name.replace("_", " ").title()
+    return f"{rank_name}: " + " ".join(REVERSE_VALUE_DICT[value] for value in values)
+
+
+def legacy_score(hand_eval):
+    """
+    Pack a (HandRank, detail) tuple from Dealer.evaluate_possible_hand.
+
+    detail is either a list of values or Counter.most_common() pairs; both
+    are flattened and re-ordered by group so ties are well defined.
+    """
+    rank, detail = hand_eval
+    if detail and isinstance(detail[0], tuple):
+        detail = [value for value, count in detail for _ in range(count)]
+    return pack_score(rank, group_values(detail)[:5])
+
+
+def group_values(values):
+    """Order card values by group size, then by value, both descending."""
+    count = Counter(values)
+    return sorted(values, key=lambda value: (count[value], value), reverse=True)
+
+
+def value_bitmask(values):
+    mask = 0
+    for value in values:
+        mask |= 1 << value
+    return mask
+
+
+def is_straight_mask(mask):
+    """True when the five set bits of the mask are consecutive values."""
+    lowest = mask & -mask
+    return mask == lowest * 0b11111
+
+
+def build_hand_tables():
+    """
+    Build the lookup tables for every 5-card value combination.
+
+    Hands with five distinct values are keyed by their value bitmask (one
+    table for flushes, one for everything else). Hands with repeated values
+    can never be a straight, so they are keyed by the product of their value
+    primes.
+    """
+    all_values = sorted(VALUE_PRIMES)
+    flush_table = {}
+    unique_table = {}
+    product_table = {}
+
+    for values in combinations(all_values, 5):
+        ordered = sorted(values, reverse=True)
+        mask = value_bitmask(values)
+        if is_straight_mask(mask):
+            flush_table[mask] = pack_score(HandRank.STRAIGHT_FLUSH, ordered)
+            unique_table[mask] = pack_score(HandRank.STRAIGHT, ordered)
+        else:
+            flush_table[mask] = pack_score(HandRank.FLUSH, ordered)
+            unique_table[mask] = pack_score(HandRank.HIGH_CARD, ordered)
+
+    for values in combinations_with_replacement(all_values, 5):
+        counts = sorted(Counter(values).values(), reverse=True)
+        if counts[0] == 1:
+            # Distinct values live in the bitmask tables.
+            continue
+        if counts[0] == 5:
+            rank = HandRank.REPOKER
+        elif counts[0] == 4:
+            rank = HandRank.POKER
+        elif counts[0] == 3 and counts[1] == 2:
+            rank = HandRank.FULL_HOUSE
+        elif counts[0] == 3:
+            rank = HandRank.THREE_OF_A_KIND
+        elif counts[1] == 2:
+            rank = HandRank.TWO_PAIR
+        else:
+            rank = HandRank.ONE_PAIR
+
+        product = 1
+        for value in values:
+            product *= VALUE_PRIMES[value]
+        product_table[product] = pack_score(rank, group_values(values))
+
+    return {
+        "version": HAND_TABLE_VERSION,
+        "flush": flush_table,
+        "unique": unique_table,
+        "products": product_table,
+    }
+
+
+def load_hand_tables(path=HAND_TABLE_PATH):
+    """Load the lookup tables from disk, building and saving them if needed."""
+    try:
+        with open(path, "rb") as table_file:
+            tables = pickle.load(table_file)
+        if tables.get("version") == HAND_TABLE_VERSION:
+            return tables
+        logging.info(f"Hand tables at {path} are out of date. Rebuilding.")
+    except (OSError, pickle.UnpicklingError, EOFError, AttributeError):
+        logging.info(f"No usable hand tables at {path}. Building them.")
+
+    tables = build_hand_tables()
+    try:
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        with open(path, "wb") as table_file:
+            pickle.dump(tables, table_file, protocol=pickle.HIGHEST_PROTOCOL)
+    except OSError as e:
+        logging.warning(f"Could not save hand tables to {path}: {e}")
+    return tables
+
+
+def solve_wild_hand(values, wild_count, suited):
+    """
+    Best packed score for the non-wild card values plus wild_count wilds.
+
+    Wild cards take any value but keep their own suit, so suited tells
+    whether all five cards (wilds included) share one suit. Adding every
+    wild to the largest group of equal values gives the best repoker,
+    poker, full house, trips or pair. A flush puts the wilds on aces and a
+    straight is built as high as the non-wild values allow.
+    """
+    count = Counter(values)
+
+    top = None
+    if len(count) == len(values):
+        low = min(values, default=14)
+        if max(values, default=low) - low <= 4:
+            top = min(14, low + 4)
+    if top and suited:
+        return pack_score(HandRank.STRAIGHT_FLUSH, range(top, top - 5, -1))
+
+    groups = sorted(count.items(), key=lambda item: (item[1], item[0]), reverse=True)
+    if groups:
+        lead_value, lead_count = groups[0]
+        rest = groups[1:]
+    else:
+        lead_value, lead_count, rest = 14, 0, []
+    lead_count += wild_count
+    ordered = [lead_value] * lead_count
+    for value, value_count in rest:
+        ordered.extend([value] * value_count)
+
+    if lead_count >= 5:
+        return pack_score(HandRank.REPOKER, ordered[:5])
+    if lead_count == 4:
+        return pack_score(HandRank.POKER, ordered)
+    if lead_count == 3 and rest and rest[0][1] == 2:
+        return pack_score(HandRank.FULL_HOUSE, ordered)
+    if suited:
+        return pack_score(
+            HandRank.FLUSH, sorted(values + [14] * wild_count, reverse=True)
+        )
+    if top:
+        return pack_score(HandRank.STRAIGHT, range(top, top - 5, -1))
+    if lead_count == 3:
+        return pack_score(HandRank.THREE_OF_A_KIND, ordered)
+    if rest and rest[0][1] == 2:
+        return pack_score(HandRank.TWO_PAIR, ordered)
+    if lead_count == 2:
+        return pack_score(HandRank.ONE_PAIR, ordered)
+    return pack_score(HandRank.HIGH_CARD, ordered)
+
+
+def solve_wild_lead(values, wild_count, suited):
+    """
+    solve_wild_hand(...) >> LEAD_SHIFT: the HandRank and the lead value.
+
+    This skips ordering the kickers. Every score with a given lead lies in
+    [lead << LEAD_SHIFT, (lead + 1) << LEAD_SHIFT), so hands whose leads
+    differ are already ordered without scoring them in full.
+    """
+    distinct = set(values)
+    high = max(values, default=14)
+    top = None
+    if len(distinct) == len(values):
+        low = min(values, default=14)
+        if high - low <= 4:
+            top = min(14, low + 4)
+            if suited:
+                return (HandRank.STRAIGHT_FLUSH << KICKER_BITS) | top
+        lead_value = high
+        lead_count = wild_count + (1 if values else 0)
+        second_count = 1 if len(values) > 1 else 0
+    else:
+        counts = sorted(
+            ((values.count(value), value) for value in distinct), reverse=True
+        )
+        lead_count, lead_value = counts[0]
+        lead_count += wild_count
+        second_count = counts[1][0] if len(counts) > 1 else 0
+
+    if lead_count >= 5:
+        rank = HandRank.REPOKER
+    elif lead_count == 4:
+        rank = HandRank.POKER
+    elif lead_count == 3 and second_count == 2:
+        rank = HandRank.FULL_HOUSE
+    elif suited:
+        return (HandRank.FLUSH << KICKER_BITS) | (14 if wild_count else high)
+    elif top:
+        return (HandRank.STRAIGHT << KICKER_BITS) | top
+    elif lead_count == 3:
+        rank = HandRank.THREE_OF_A_KIND
+    elif second_count == 2:
+        rank = HandRank.TWO_PAIR
+    elif lead_count == 2:
+        rank = HandRank.ONE_PAIR
+    else:
+        rank = HandRank.HIGH_CARD
+    return (rank << KICKER_BITS) | lead_value
+
+
+_default_evaluator = None
+
+
+def default_evaluator():
+    """Shared TableEvaluator, so the tables are loaded once per process."""
+    global _default_evaluator
+    if _default_evaluator is None:
+        _default_evaluator = TableEvaluator()
+    return _default_evaluator
+
+
+class TableEvaluator:
+    """
+    Lookup-table replacement for Dealer.evaluate_possible_hand.
+
+    Every hand maps to a packed integer score (see pack_score) in at most
+    two dictionary lookups, so scores compare with plain int operations.
+    """
+
+    def __init__(self, table_path=HAND_TABLE_PATH):
+        tables = load_hand_tables(table_path)
+        self.flush_table = tables["flush"]
+        self.unique_table = tables["unique"]
+        self.product_table = tables["products"]
+
+    def lookup(self, mask, product, suited):
+        """
+        Score five non-wild values from their bitmask and prime product.
+
+        Callers that track both incrementally (see HandState) skip
+        rebuilding them from the cards.
+        """
+        if bin(mask).count("1") == 5:
+            if suited:
+                return self.flush_table[mask]
+            return self.unique_table[mask]
+        return self.product_table.get(product, 0)
+
+    def evaluate_values(self, values, suits):
+        """Score five card values (2-14) with their suits."""
+        mask = 0
+        product = 1
+        for value in values:
+            mask |= 1 << value
+            product *= VALUE_PRIMES[value]
+
+        suited = len(set(suits)) == 1
+        score = self.lookup(mask, product, suited)
+        if bin(mask).count("1") == 5:
+            return score
+
+        # Repeated values only come from wild cards. A suited hand still
+        # counts as a flush unless the repeats already make something better.
+        if suited and score >> SCORE_SHIFT < HandRank.FLUSH:
+            return pack_score(HandRank.FLUSH, sorted(values, reverse=True))
+        return score
+
+    def evaluate(self, hand, wild_card_value=None):
+        """
+        Score a hand of Card objects, solving wild cards in closed form.
+
+        Cards whose value equals wild_card_value (see WildContext) are wild.
+        """
+        values = []
+        suits = []
+        wild_count = 0
+        for card in hand:
+            if card.value == wild_card_value:
+                wild_count += 1
+            else:
+                values.append(CODE_VALUES[card.code])
+            suits.append(card.suit)
+
+        if not wild_count:
+            return self.evaluate_values(values, suits)
+        return solve_wild_hand(values, wild_count, len(set(suits)) == 1)
@@ -0,0 +1,80 @@
+from collections import namedtuple
+
+from .evaluator import HandRank, pack_score
+from .hand_state import HandState
+
+PASS = "pass"
+EXCHANGE = "exchange"  # PlayerWindow.exchange_cards: swap the whole hand
+SWAP = "swap"  # CardWidget.handle_card_movement: one card for one card
+
+# hand_index / reveal_index are only set for SWAP moves.
+ExchangeMove = namedtuple("ExchangeMove", "kind hand_index reveal_index score")
+
+# Nothing beats an ace-high straight flush, so the search can stop there.
+BEST_POSSIBLE_SCORE = pack_score(HandRank.STRAIGHT_FLUSH, [14, 13, 12, 11, 10])
+
+
+def describe_move(move, hand, reveal):
+    if move.kind == SWAP:
+        return f"Swap {hand[move.hand_index]!r} for {reveal[move.reveal_index]!r}"
+    if move.kind == EXCHANGE:
+        return "Exchange all cards"
+    return "Pass"
+
+
+def exchange_moves(hand, reveal, wild_card_value=None):
+    """
+    Yield every distinct legal move with the score of the resulting hand.
+
+    Swaps are scored incrementally on one HandState. Reveal cards that
+    would give the same hand as one already tried for the same slot are
+    skipped: same value, and a suit that cannot matter because the other
+    four cards are not all one suit. Cards of wild_card_value are wild.
+    """
+    state = HandState(hand, wild_card_value=wild_card_value)
+    yield ExchangeMove(PASS, None, None, state.best_score())
+    yield ExchangeMove(
+        EXCHANGE,
+        None,
+        None,
+        HandState(reveal, wild_card_value=wild_card_value).best_score(),
+    )
+
+    for hand_index, old_card in enumerate(hand):
+        state.remove(old_card)
+        # The incoming card's suit only matters if the other four are suited.
+        flush_suit = None
+        for suit, count in state.suit_counts.items():
+            if count == 4:
+                flush_suit = suit
+
+        tried = set()
+        for reveal_index, new_card in enumerate(reveal):
+            key = (
+                new_card.code >> 2,
+                new_card.suit if new_card.suit == flush_suit else None,
+            )
+            if key in tried:
+                continue
+            tried.add(key)
+
+            state.add(new_card)
+            yield ExchangeMove(SWAP, hand_index, reveal_index, state.best_score())
+            state.remove(new_card)
+        state.add(old_card)
+
+
+def best_exchange(hand, reveal, wild_card_value=None):
+    """
+    Best move for a player holding hand with the face-up reveal cards.
+
+    Ties go to the first move found, so passing is preferred over an
+    exchange, and an exchange over a single swap.
+    """
+    best_move = None
+    for move in exchange_moves(hand, reveal, wild_card_value):
+        if best_move is None or move.score > best_move.score:
+            best_move = move
+            if move.score >= BEST_POSSIBLE_SCORE:
+                break
+    return best_move
@@ -0,0 +1,281 @@
+"""
+The rules of Viuda as a headless state machine.
+
+ViudaGame holds one whole game: chips, side chips, who is still in, the
+hands and reveal cards of the current hand, and whose turn it is. It
+advances only through apply(action), with the actions legal_actions()
+lists, so the same rules run behind the Qt windows and in simulations:
+
+    game = ViudaGame(3, seed=1)
+    while game.phase != GAME_OVER:
+        game.start_hand()
+        while game.phase in (PLAYING, SIDE_CHIP):
+            game.apply(choose(game.legal_actions()))
+
+Seats are 0-based (PlayerWindow.player_index). The rules follow the game
+windows: reveal swaps a hand for the face-down reveal cards and turns them
+up; after that a player may exchange the whole hand or swap one card. A
+hand ends when every active player passes in a row, or one full round
+after a call. The worst hand pays a chip to the table; a player left
+without chips may take the side chip or is out.
+"""
+
+import copy
+from collections import namedtuple
+
+from .card import Deck
+from .encoding import CARD_COUNT
+from .exchange_solver import EXCHANGE, PASS, SWAP
+from .showdown import showdown
+
+REVEAL = "reveal"  # PlayerWindow.reveal_cards: swap for the face-down reveal cards
+CALL = "call"  # PlayerWindow.call_cards: everyone else gets one more turn
+TAKE_SIDE_CHIP = "take_side_chip"
+DECLINE_SIDE_CHIP = "decline_side_chip"
+
+ACTIVE = "Active"
+OUT = "Out"
+
+PLAYING = "playing"
+SIDE_CHIP = "side_chip"  # The loser of the hand is out of chips and must decide
+HAND_OVER = "hand_over"
+GAME_OVER = "game_over"
+
+HAND_SIZE = 5
+
+# hand_index / reveal_index are only set for SWAP actions.
+Action = namedtuple("Action", "kind hand_index reveal_index")
+
+PASS_ACTION = Action(PASS, None, None)
+REVEAL_ACTION = Action(REVEAL, None, None)
+EXCHANGE_ACTION = Action(EXCHANGE, None, None)
+CALL_ACTION = Action(CALL, None, None)
+TAKE_SIDE_CHIP_ACTION = Action(TAKE_SIDE_CHIP, None, None)
+DECLINE_SIDE_CHIP_ACTION = Action(DECLINE_SIDE_CHIP, None, None)
+SWAP_ACTIONS = tuple(
+    Action(SWAP, hand_index, reveal_index)
+    for hand_index in range(HAND_SIZE)
+    for reveal_index in range(HAND_SIZE)
+)
+SIDE_CHIP_ACTIONS = (TAKE_SIDE_CHIP_ACTION, DECLINE_SIDE_CHIP_ACTION)
+
+# A player's choices depend only on whether the reveal cards are up and
+# whether someone has called: (revealed, call made) -> legal actions.
+TURN_ACTIONS = {}
+for revealed in (False, True):
+    for call_made in (False, True):
+        actions = [PASS_ACTION]
+        if revealed:
+            actions.append(EXCHANGE_ACTION)
+            actions.extend(SWAP_ACTIONS)
+        else:
+            actions.append(REVEAL_ACTION)
+        if not call_made:
+            actions.append(CALL_ACTION)
+        TURN_ACTIONS[revealed, call_made] = tuple(actions)
+TURN_ACTION_SETS = {key: frozenset(actions) for key, actions in TURN_ACTIONS.items()}
+
+# Seats, not positions among the active players. scores holds the packed
+# scores showdown() needed to settle the hand, leads the rank and lead
+# value of every active hand. eliminated is the seat that went out after
+# this hand, if any.
+HandResult = namedtuple("HandResult", "winner loser scores leads eliminated")
+
+
+class ViudaGame:
+    def __init__(
+        self, num_players, chips=1, table_chips=1, side_chips=1, seed=None, deck=None
+    ):
+        if num_players < 2:
+            raise ValueError("Viuda needs at least two players")
+        self.num_players = num_players
+        # Pass the game window's deck to share its WildContext with the UI.
+        self.deck = deck if deck is not None else Deck(seed=seed)
+        # Every player and the reveal cards get a hand from one deal.
+        needed = (num_players + 1) * HAND_SIZE
+        if needed > CARD_COUNT * self.deck.decks:
+            raise ValueError(
+                f"{num_players} players and the reveal cards need {needed} "
+                f"cards; the deck has {CARD_COUNT * self.deck.decks}"
+            )
+        self.wild = self.deck.wild
+        self.chips = [chips] * num_players
+        self.statuses = [ACTIVE] * num_players
+        self.table_chips = table_chips
+        self.side_chips = side_chips
+
+        self.phase = HAND_OVER
+        self.hand_number = 0
+        self.hand_starter = None
+        self.hands = [[] for _ in range(num_players)]
+        self.reveal_cards = []
+        self.active_count = num_players
+        self.next_seat = []
+        self.current_player = None
+        self.revealed = False
+        self.call_made = False
+        self.calling_player = None
+        self.turns_after_call = 0
+        self.consecutive_passes = 0
+        self.last_result = None
+        self.winner = None
+
+    def active_players(self):
+        return [
+            seat for seat in range(self.num_players) if self.statuses[seat] == ACTIVE
+        ]
+
+    def next_active(self, seat):
+        """The next active seat after seat, wrapping around, or None."""
+        for step in range(1, self.num_players + 1):
+            next_seat = (seat + step) % self.num_players
+            if self.statuses[next_seat] == ACTIVE and next_seat != seat:
+                return next_seat
+        return None
+
+    def start_hand(self):
+        """Deal the next hand; the starting seat moves to the next active player."""
+        if self.phase != HAND_OVER:
+            raise ValueError(f"Cannot start a hand while the game is {self.phase}")
+        previous = -1 if self.hand_starter is None else self.hand_starter
+        self.hand_starter = self.next_active(previous)
+        self.wild.update_from_table_chips(self.table_chips)
+
+        active = self.active_players()
+        required_cards = (len(active) + 1) * HAND_SIZE
+        if not self.hand_number or self.deck.remaining_cards() < required_cards:
+            self.deck.shuffle()
+        self.reveal_cards, *dealt = self.deck.deal_hands(len(active) + 1)
+        self.hands = [[] for _ in range(self.num_players)]
+        for seat, hand in zip(active, dealt):
+            self.hands[seat] = hand
+
+        self.hand_number += 1
+        self.set_turn_order()
+        self.current_player = self.hand_starter
+        self.revealed = False
+        self.call_made = False
+        self.calling_player = None
+        self.turns_after_call = 0
+        self.consecutive_passes = 0
+        self.last_result = None
+        self.phase = PLAYING
+
+    def set_turn_order(self):
+        # Nobody joins or leaves during a hand, so turn order is fixed.
+        self.active_count = self.statuses.count(ACTIVE)
+        self.next_seat = [self.next_active(seat) for seat in range(self.num_players)]
+
+    def clone(self):
+        """
+        A copy to play ahead on (core.ismcts): hands, reveal cards, chips and
+        statuses are copied; the deck and the wild context are shared.
+        """
+        other = copy.copy(self)
+        other.chips = list(self.chips)
+        other.statuses = list(self.statuses)
+        other.hands = [list(hand) for hand in self.hands]
+        other.reveal_cards = list(self.reveal_cards)
+        return other
+
+    def legal_actions(self):
+        if self.phase == SIDE_CHIP:
+            return SIDE_CHIP_ACTIONS
+        if self.phase != PLAYING:
+            return ()
+        return TURN_ACTIONS[self.revealed, self.call_made]
+
+    def is_legal(self, action):
+        if self.phase == SIDE_CHIP:
+            return action in SIDE_CHIP_ACTIONS
+        if self.phase != PLAYING:
+            return False
+        return action in TURN_ACTION_SETS[self.revealed, self.call_made]
+
+    def apply(self, action):
+        """Play action for the current player (or the side chip decision)."""
+        if not self.is_legal(action):
+            raise ValueError(f"Illegal action {action} while {self.phase}")
+        kind = action.kind
+        if self.phase == SIDE_CHIP:
+            self.resolve_side_chip(kind == TAKE_SIDE_CHIP)
+            return
+
+        seat = self.current_player
+        if kind == PASS:
+            self.consecutive_passes += 1
+        else:
+            self.consecutive_passes = 0
+            if kind == REVEAL or kind == EXCHANGE:
+                self.hands[seat], self.reveal_cards = (
+                    self.reveal_cards,
+                    self.hands[seat],
+                )
+                self.revealed = True
+            elif kind == SWAP:
+                hand = self.hands[seat]
+                reveal = self.reveal_cards
+                hand[action.hand_index], reveal[action.reveal_index] = (
+                    reveal[action.reveal_index],
+                    hand[action.hand_index],
+                )
+            elif kind == CALL:
+                self.call_made = True
+                self.calling_player = seat
+                self.turns_after_call = 1
+
+        # The call itself counts as the first turn of the final round.
+        if self.call_made and kind != CALL:
+            self.turns_after_call += 1
+        self.current_player = self.next_seat[seat]
+        self.check_end_hand()
+
+    def check_end_hand(self):
+        all_passed = self.consecutive_passes >= self.active_count > 1
+        round_after_call = self.call_made and self.turns_after_call >= self.active_count
+        if all_passed or round_after_call:
+            self.end_hand()
+
+    def end_hand(self):
+        """Showdown: the worst hand pays the table one chip."""
+        active = self.active_players()
+        result = showdown([self.hands[seat] for seat in active], None, self.wild.value)
+        winner = active[result.winner]
+        loser = active[result.loser]
+        scores = {active[index]: score for index, score in result.scores.items()}
+        leads = dict(zip(active, result.leads))
+        self.last_result = HandResult(winner, loser, scores, leads, None)
+
+        self.chips[loser] = max(0, self.chips[loser] - 1)
+        self.table_chips += 1
+        self.current_player = None
+        if self.chips[loser] <= 0:
+            if self.side_chips > 0:
+                self.phase = SIDE_CHIP
+                self.current_player = loser
+                return
+            self.eliminate(loser)
+        self.finish_hand()
+
+    def resolve_side_chip(self, take):
+        loser = self.current_player
+        if take:
+            self.side_chips -= 1
+            self.chips[loser] += 1
+        else:
+            self.eliminate(loser)
+        self.current_player = None
+        self.finish_hand()
+
+    def eliminate(self, seat):
+        self.statuses[seat] = OUT
+        self.chips[seat] = 0
+        self.last_result = self.last_result._replace(eliminated=seat)
+
+    def finish_hand(self):
+        active = self.active_players()
+        if len(active) <= 1:
+            self.winner = active[0] if active else None
+            self.phase = GAME_OVER
+        else:
+            self.phase = HAND_OVER
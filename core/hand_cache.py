@@ -0,0 +1,60 @@
+from collections import OrderedDict
+
+
+class HandCache:
+    """
+    Bounded LRU cache for hand evaluations, keyed by a canonical hand.
+
+    Two hands share a key when they have the same values under the same
+    wild card value and either both or neither can be a flush. Suits only
+    matter for flushes, so every other suit combination collapses onto one
+    entry.
+    """
+
+    def __init__(self, maxsize=4096):
+        self.maxsize = maxsize
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.wild_card_value = None
+
+    def canonical_key(self, hand):
+        suited = len({card.suit for card in hand}) == 1
+        cards = tuple(sorted(card.code >> 2 for card in hand))
+        return self.wild_card_value, suited, cards
+
+    def lookup(self, hand, evaluate):
+        """Return the cached result for the hand, calling evaluate(hand) on a miss."""
+        key = self.canonical_key(hand)
+        try:
+            result = self.entries[key]
+        except KeyError:
+            self.misses += 1
+            result = evaluate(hand)
+            self.entries[key] = result
+            if len(self.entries) > self.maxsize:
+                self.entries.popitem(last=False)
+            return result
+
+        self.hits += 1
+        self.entries.move_to_end(key)
+        return result
+
+    def invalidate(self, wild_card_value=None):
+        """Drop every entry when the wild card value rotates."""
+        if wild_card_value != self.wild_card_value:
+            self.entries.clear()
+            self.wild_card_value = wild_card_value
+
+    def clear(self):
+        self.entries.clear()
+        self.hits = 0
+        self.misses = 0
+
+    def stats(self):
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "size": len(self.entries),
+            "maxsize": self.maxsize,
+        }
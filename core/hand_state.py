@@ -0,0 +1,105 @@
+from collections import Counter
+
+from .encoding import CODE_VALUES
+from .evaluator import VALUE_PRIMES, default_evaluator, score_rank, solve_wild_hand
+
+
+class HandState:
+    """
+    Running value counts, suit counts, value bitmask and wild count for a
+    hand that changes one card at a time.
+
+    add() and remove() are O(1), so the current best hand can be read after
+    every drag, swap or exchange without re-evaluating from scratch. Hands
+    without wild cards are scored straight from the evaluator tables.
+    """
+
+    def __init__(self, cards=(), evaluator=None, wild_card_value=None):
+        self.evaluator = evaluator or default_evaluator()
+        self.wild_card_value = wild_card_value
+        self.clear()
+        for card in cards:
+            self.add(card)
+
+    def clear(self):
+        self.value_counts = [0] * 15
+        self.suit_counts = {}
+        self.value_mask = 0  # Bit v is set while a non-wild card of value v is held
+        self.value_product = 1  # Product of VALUE_PRIMES over non-wild cards
+        self.wild_count = 0
+        self.size = 0
+        # Copies held of each card code, and how many were counted as wild.
+        # A multi-deck shoe (Deck(decks=2)) can deal the same card twice.
+        self.held_codes = Counter()
+        self.wild_codes = Counter()
+
+    def add(self, card):
+        is_wild = card.value == self.wild_card_value
+        self.suit_counts[card.suit] = self.suit_counts.get(card.suit, 0) + 1
+        self.size += 1
+        self.held_codes[card.code] += 1
+        if is_wild:
+            self.wild_codes[card.code] += 1
+            self.wild_count += 1
+            return
+        value = CODE_VALUES[card.code]
+        self.value_counts[value] += 1
+        self.value_mask |= 1 << value
+        self.value_product *= VALUE_PRIMES[value]
+
+    def remove(self, card):
+        code = card.code
+        if not self.held_codes[code]:
+            raise KeyError(code)
+        self.held_codes[code] -= 1
+        self.suit_counts[card.suit] -= 1
+        self.size -= 1
+        # Count the card as wild if it (or a copy) was wild when added, in
+        # case wild_card_value was changed in between.
+        if self.wild_codes[code]:
+            self.wild_codes[code] -= 1
+            self.wild_count -= 1
+            return
+        value = CODE_VALUES[code]
+        self.value_counts[value] -= 1
+        self.value_product //= VALUE_PRIMES[value]
+        if not self.value_counts[value]:
+            self.value_mask &= ~(1 << value)
+
+    def set_wild_card_value(self, wild_card_value, cards):
+        """Recount cards, the hand currently held, under a new wild card value."""
+        self.wild_card_value = wild_card_value
+        self.clear()
+        for card in cards:
+            self.add(card)
+
+    def replace(self, old_card, new_card):
+        self.remove(old_card)
+        self.add(new_card)
+
+    def values(self):
+        """Non-wild card values currently held."""
+        values = []
+        mask = self.value_mask
+        while mask:
+            value = mask.bit_length() - 1
+            values.extend([value] * self.value_counts[value])
+            mask &= ~(1 << value)
+        return values
+
+    def is_suited(self):
+        return self.size == 5 and self.size in self.suit_counts.values()
+
+    def best_score(self):
+        """Packed score of the best five-card hand, or None if not 5 cards."""
+        if self.size != 5:
+            return None
+        if not self.wild_count:
+            return self.evaluator.lookup(
+                self.value_mask, self.value_product, self.is_suited()
+            )
+        return solve_wild_hand(self.values(), self.wild_count, self.is_suited())
+
+    def best_rank(self):
+        score = self.best_score()
+        return None if score is None else score_rank(score)
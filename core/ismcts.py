@@ -0,0 +1,320 @@
+"""
+Information set Monte Carlo tree search (ISMCTS) bot.
+
+The bot only sees its own hand and, once they are up, the reveal cards.
+Each playout deals the cards it cannot see (the other active hands, and
+the reveal cards while they are face down) at random from the rest of the
+deck, then plays that deal on a ViudaGame clone to the end of the hand:
+down a shared tree of moves chosen by UCB1, then with a cheap greedy
+rollout (rollout_action). The tree only holds actions, so statistics from
+every deal add up in the same nodes (single-observer ISMCTS). A move
+scores 1 for the player who made it unless that player pays the table at
+the showdown. The searching player only considers its best few swaps.
+
+Search is anytime: it stops at the deadline and plays the most visited
+move. The reveal cards a player gave away in an exchange are not
+remembered, since the Observation does not include them.
+
+    python -m core.ismcts --budget 1 --players 4 --seed 3
+"""
+
+import argparse
+import math
+import time
+from collections import namedtuple
+
+from .bot_base import Bot, observe
+from .card import CARDS, Deck
+from .evaluator import KICKER_BITS, HandRank, default_evaluator, solve_wild_lead
+from .exchange_solver import SWAP, exchange_moves
+from .game import (
+    ACTIVE,
+    CALL_ACTION,
+    Action,
+    EXCHANGE_ACTION,
+    HAND_SIZE,
+    PASS_ACTION,
+    PLAYING,
+    REVEAL_ACTION,
+    SIDE_CHIP,
+    SWAP_ACTIONS,
+    TAKE_SIDE_CHIP_ACTION,
+    ViudaGame,
+)
+from .showdown import hand_parts
+
+EXPLORATION = 0.7  # UCB1 constant; rewards are 0 or 1
+# The searching player's own swaps are limited to the best few that improve
+# the hand; the other 20-odd are almost never right and would split the
+# playouts.
+ROOT_SWAPS = 4
+# Random swaps a rollout player tries before settling for pass or call.
+ROLLOUT_SWAPS = 3
+# Rollout players reveal hands weaker than this rank and lead value.
+REVEAL_BELOW = HandRank.TWO_PAIR << KICKER_BITS
+# Seconds the search leaves free before the deadline, for the move's
+# bookkeeping and timer jitter.
+SAFETY_MARGIN = 0.002
+
+# visits is {action: (visits, mean reward)} for the searching seat's moves.
+SearchResult = namedtuple(
+    "SearchResult", "action playouts elapsed playouts_per_second visits"
+)
+
+
+class Node:
+    __slots__ = ("action", "seat", "children", "untried", "visits", "reward")
+
+    def __init__(self, action=None, seat=None):
+        self.action = action
+        self.seat = seat  # Who played action, and whose reward this node keeps
+        self.children = {}
+        self.untried = None
+        self.visits = 0
+        self.reward = 0.0
+
+
+def hand_lead(hand, wild_card_value):
+    """Rank and lead value of a hand (the top bits of its score): cheap strength."""
+    return solve_wild_lead(*hand_parts(hand, wild_card_value))
+
+
+def rollout_action(game, rng):
+    """
+    A quick greedy move: reveal with less than two pair, take the reveal
+    cards if they are stronger, else the best of a few random swaps if one
+    helps, else pass or (half the time) call. Hands are compared by rank
+    and lead value only, so a move costs some tens of microseconds.
+    """
+    wild = game.wild.value
+    hand = game.hands[game.current_player]
+    lead = hand_lead(hand, wild)
+    if not game.revealed:
+        if lead < REVEAL_BELOW:
+            return REVEAL_ACTION
+    else:
+        reveal = game.reveal_cards
+        if hand_lead(reveal, wild) > lead:
+            return EXCHANGE_ACTION
+        best_swap = None
+        for _ in range(ROLLOUT_SWAPS):
+            swap = SWAP_ACTIONS[int(rng.random() * len(SWAP_ACTIONS))]
+            swapped = list(hand)
+            swapped[swap.hand_index] = reveal[swap.reveal_index]
+            swapped_lead = hand_lead(swapped, wild)
+            if swapped_lead > lead:
+                lead = swapped_lead
+                best_swap = swap
+        if best_swap is not None:
+            return best_swap
+    if not game.call_made and rng.random() < 0.5:
+        return CALL_ACTION
+    return PASS_ACTION
+
+
+def root_actions(observation):
+    """The searching player's candidate moves: see ROOT_SWAPS."""
+    if not observation.revealed:
+        return list(observation.legal_actions)
+    moves = list(
+        exchange_moves(
+            observation.hand, observation.reveal_cards, observation.wild_value
+        )
+    )
+    pass_score = moves[0].score
+    swaps = sorted(
+        (move for move in moves if move.kind == SWAP and move.score > pass_score),
+        key=lambda move: -move.score,
+    )
+    swap_actions = {
+        Action(SWAP, move.hand_index, move.reveal_index) for move in swaps[:ROOT_SWAPS]
+    }
+    return [
+        action
+        for action in observation.legal_actions
+        if action.kind != SWAP or action in swap_actions
+    ]
+
+
+def root_game(observation, deck=None):
+    """
+    The observed position as a ViudaGame, without the cards it cannot see.
+    Pass a deck to reuse: the game never deals from it.
+    """
+    game = ViudaGame(len(observation.chips), deck=deck)
+    game.wild.set_value(observation.wild_value)
+    game.chips = list(observation.chips)
+    game.statuses = list(observation.statuses)
+    game.table_chips = observation.table_chips
+    game.side_chips = observation.side_chips
+    game.hands[observation.seat] = list(observation.hand)
+    game.reveal_cards = list(observation.reveal_cards)
+    game.phase = PLAYING
+    game.current_player = observation.seat
+    game.revealed = observation.revealed
+    game.call_made = observation.call_made
+    game.calling_player = observation.calling_player
+    game.turns_after_call = observation.turns_after_call
+    game.consecutive_passes = observation.consecutive_passes
+    game.set_turn_order()
+    return game
+
+
+class ISMCTSBot(Bot):
+    """See the module docstring."""
+
+    name = "ismcts"
+
+    def __init__(self, seed=None, exploration=EXPLORATION, max_playouts=None):
+        super().__init__(seed)
+        self.exploration = exploration
+        self.max_playouts = max_playouts
+        self.last_search = None
+        self.deck = Deck()
+        # Load the hand tables now rather than inside the first timed decision.
+        default_evaluator()
+
+    def choose(self, observation, deadline):
+        if observation.phase == SIDE_CHIP:
+            return TAKE_SIDE_CHIP_ACTION
+        self.last_search = self.search(observation, deadline)
+        return self.last_search.action
+
+    def search(self, observation, deadline):
+        """
+        Run playouts until deadline (a time.perf_counter() value). With no
+        time for even one, play the greedy rollout move instead.
+        """
+        start = time.perf_counter()
+        rng = self.rng
+        root = Node()
+        root.untried = root_actions(observation)
+        rng.shuffle(root.untried)
+        game = root_game(observation, self.deck)
+
+        seen = set(observation.hand) | set(observation.reveal_cards)
+        unseen = [card for card in CARDS if card not in seen]
+        hidden_seats = [
+            seat
+            for seat, status in enumerate(game.statuses)
+            if status == ACTIVE and seat != observation.seat
+        ]
+        hidden_count = len(hidden_seats) * HAND_SIZE
+        if not observation.revealed:
+            hidden_count += HAND_SIZE
+
+        playouts = 0
+        while playouts != self.max_playouts:
+            now = time.perf_counter()
+            # Stop when another playout of average length, setup included,
+            # would cut into the margin. Before the first one, the setup
+            # time (a root exchange_moves, several playouts' worth) stands
+            # in for it.
+            estimate = (now - start) / playouts if playouts else now - start
+            if now + estimate + SAFETY_MARGIN > deadline:
+                break
+            deal = rng.sample(unseen, hidden_count)
+            playout = game.clone()
+            for index, seat in enumerate(hidden_seats):
+                playout.hands[seat] = deal[index * HAND_SIZE : (index + 1) * HAND_SIZE]
+            if not observation.revealed:
+                playout.reveal_cards = deal[-HAND_SIZE:]
+            self.playout(root, playout, rng)
+            playouts += 1
+
+        if not playouts:
+            action = rollout_action(game, rng)
+            elapsed = time.perf_counter() - start
+            return SearchResult(action, 0, elapsed, 0.0, {})
+
+        elapsed = time.perf_counter() - start
+        best = max(root.children.values(), key=lambda child: child.visits)
+        visits = {
+            action: (child.visits, child.reward / child.visits)
+            for action, child in root.children.items()
+        }
+        return SearchResult(
+            best.action,
+            playouts,
+            elapsed,
+            playouts / elapsed if elapsed else 0.0,
+            visits,
+        )
+
+    def playout(self, root, game, rng):
+        """One tree descent, expansion and rollout on a determinized game."""
+        node = root
+        path = [root]
+        while game.phase == PLAYING:
+            if node.untried is None:
+                # The legal moves follow from the moves so far (reveal, call),
+                # never from hidden cards, so they are the same in every deal.
+                node.untried = list(game.legal_actions())
+                rng.shuffle(node.untried)
+            seat = game.current_player
+            if node.untried:
+                action = node.untried.pop()
+                child = Node(action, seat)
+                node.children[action] = child
+                game.apply(action)
+                path.append(child)
+                break
+            # UCB1: mean reward + exploration * sqrt(ln(parent visits) / visits)
+            scale = self.exploration * math.sqrt(math.log(node.visits))
+            best_value = -1.0
+            for child in node.children.values():
+                visits = child.visits
+                value = (child.reward + scale * math.sqrt(visits)) / visits
+                if value > best_value:
+                    best_value = value
+                    best = child
+            node = best
+            game.apply(node.action)
+            path.append(node)
+
+        while game.phase == PLAYING:
+            game.apply(rollout_action(game, rng))
+
+        loser = game.last_result.loser
+        for node in path:
+            node.visits += 1
+            if node.seat is not None and node.seat != loser:
+                node.reward += 1.0
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--budget", type=float, default=1.0, help="seconds")
+    parser.add_argument("--players", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument(
+        "--reveal", action="store_true", help="search after the reveal cards are up"
+    )
+    args = parser.parse_args()
+
+    game = ViudaGame(args.players, seed=args.seed)
+    game.start_hand()
+    if args.reveal:
+        game.apply(REVEAL_ACTION)
+    observation = observe(game)
+    bot = ISMCTSBot(seed=args.seed)
+    result = bot.search(observation, time.perf_counter() + args.budget)
+
+    print(f"Hand: {' '.join(map(repr, observation.hand))}")
+    if observation.revealed:
+        print(f"Reveal cards: {' '.join(map(repr, observation.reveal_cards))}")
+    print(f"Wild: {observation.wild_value}")
+    ranked = sorted(result.visits.items(), key=lambda item: -item[1][0])
+    for action, (visits, reward) in ranked[:8]:
+        print(
+            f"  {action.kind:<8} {str(action.hand_index):>4} {str(action.reveal_index):>4}"
+            f" {visits:>8,} visits {reward:6.3f}"
+        )
+    print(
+        f"Best: {result.action.kind}; {result.playouts:,} playouts in "
+        f"{result.elapsed:.2f}s ({result.playouts_per_second:,.0f}/s)"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,135 @@
+import bisect
+import logging
+import os
+import pickle
+from collections import Counter
+from itertools import combinations_with_replacement
+from math import comb
+
+from viuda_card_config import CACHE_DIR, REVERSE_VALUE_DICT, VALUE_DICT
+
+from .evaluator import solve_wild_hand
+
+PERCENTILE_TABLE_VERSION = 1
+PERCENTILE_TABLE_PATH = os.path.join(CACHE_DIR, "percentile_tables.pkl")
+
+# Same numbering as Deck.update_wild_card: 1 is the ace, 2-13 are 2-K.
+WILD_CARD_NUMBERS = range(1, 14)
+
+
+def count_hands_by_score(wild_card_value):
+    """
+    Count how many of the 2,598,960 five-card hands reach each score.
+
+    Scores only depend on the value multiset and on whether the hand is a
+    flush, so each multiset is solved once and weighted by the number of
+    suit assignments it has.
+    """
+    wild = VALUE_DICT[wild_card_value]
+    counts = Counter()
+    for values in combinations_with_replacement(range(2, 15), 5):
+        value_counts = Counter(values)
+        if max(value_counts.values()) > 4:
+            continue
+
+        non_wild = [value for value in values if value != wild]
+        wild_count = 5 - len(non_wild)
+        hands = 1
+        for value_count in value_counts.values():
+            hands *= comb(4, value_count)
+
+        if len(value_counts) == 5:
+            # Five distinct values: 4 all-one-suit hands, the rest offsuit.
+            counts[solve_wild_hand(non_wild, wild_count, True)] += 4
+            hands -= 4
+        counts[solve_wild_hand(non_wild, wild_count, False)] += hands
+    return counts
+
+
+def build_percentile_table(wild_card_value):
+    """Map every reachable score to the fraction of hands it strictly beats."""
+    counts = count_hands_by_score(wild_card_value)
+    total = sum(counts.values())
+    table = {}
+    below = 0
+    for score in sorted(counts):
+        table[score] = below / total
+        below += counts[score]
+    return table
+
+
+def build_percentile_tables():
+    return {
+        "version": PERCENTILE_TABLE_VERSION,
+        "tables": {
+            REVERSE_VALUE_DICT[number]: build_percentile_table(
+                REVERSE_VALUE_DICT[number]
+            )
+            for number in WILD_CARD_NUMBERS
+        },
+    }
+
+
+def load_percentile_tables(path=PERCENTILE_TABLE_PATH):
+    """Load the per-wild-value tables from disk, building and saving them if needed."""
+    try:
+        with open(path, "rb") as table_file:
+            tables = pickle.load(table_file)
+        if tables.get("version") == PERCENTILE_TABLE_VERSION:
+            return tables["tables"]
+        logging.info(f"Percentile tables at {path} are out of date. Rebuilding.")
+    except (OSError, pickle.UnpicklingError, EOFError, AttributeError):
+        logging.info(f"No usable percentile tables at {path}. Building them.")
+
+    tables = build_percentile_tables()
+    try:
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        with open(path, "wb") as table_file:
+            pickle.dump(tables, table_file, protocol=pickle.HIGHEST_PROTOCOL)
+    except OSError as e:
+        logging.warning(f"Could not save percentile tables to {path}: {e}")
+    return tables["tables"]
+
+
+_default_percentiles = None
+
+
+def default_percentiles():
+    """Shared HandPercentiles, so the tables are loaded once per process."""
+    global _default_percentiles
+    if _default_percentiles is None:
+        _default_percentiles = HandPercentiles()
+    return _default_percentiles
+
+
+class HandPercentiles:
+    """
+    O(1) lookup of how a score ranks among all possible 5-card hands.
+
+    Tables are keyed by the wild card value string held in
+    Deck.wild_card_value, one per value Deck.update_wild_card can produce.
+    """
+
+    def __init__(self, table_path=PERCENTILE_TABLE_PATH):
+        self.tables = load_percentile_tables(table_path)
+        self.sorted_scores = {}
+
+    def beats(self, score, wild_card_value):
+        """Fraction (0-1) of all 5-card hands that this score strictly beats."""
+        table = self.tables[wild_card_value]
+        try:
+            return table[score]
+        except KeyError:
+            # Not reachable under this wild value (e.g. a hand built by
+            # hand); fall back to a binary search over the known scores.
+            if wild_card_value not in self.sorted_scores:
+                self.sorted_scores[wild_card_value] = sorted(table)
+            scores = self.sorted_scores[wild_card_value]
+            index = bisect.bisect_left(scores, score)
+            if index == len(scores):
+                return 1.0
+            return table[scores[index]]
+
+    def beats_for_number(self, score, wild_card_number):
+        """Same as beats(), with the wild card given as 1-13 like Deck.update_wild_card."""
+        return self.beats(score, REVERSE_VALUE_DICT[wild_card_number])
@@ -0,0 +1,77 @@
+"""
+Seeded shoe of card codes for simulations.
+
+A Shoe holds one or more decks as a numpy array of card codes (see
+core.encoding) and deals slices of it, so dealing never builds Card
+objects and the hands go straight into BatchEvaluator.evaluate():
+
+    shoe = Shoe(seed=7)
+    shoe.shuffle()
+    hands = shoe.deal_hands(6)  # (6, 5) array of codes
+
+Every shoe draws from its own numpy Generator. The same seed gives the
+same shuffles, and spawn() splits off independent streams for parallel
+workers.
+"""
+
+import numpy as np
+
+DECK_SIZE = 52
+
+
+class Shoe:
+    def __init__(self, decks=1, seed=None):
+        if isinstance(seed, np.random.SeedSequence):
+            self.seed_sequence = seed
+        else:
+            self.seed_sequence = np.random.SeedSequence(seed)
+        self.rng = np.random.default_rng(self.seed_sequence)
+        self.decks = decks
+        self.codes = np.tile(np.arange(DECK_SIZE, dtype=np.int8), decks)
+        self.position = 0
+
+    def __len__(self):
+        return len(self.codes)
+
+    def remaining(self):
+        return len(self.codes) - self.position
+
+    def shuffle(self):
+        """
+        Gather every card back and shuffle.
+
+        The shuffled codes go into a new array, so hands dealt before the
+        shuffle keep their cards.
+        """
+        self.codes = self.rng.permutation(self.codes)
+        self.position = 0
+
+    def deal(self, num_cards):
+        """The next num_cards codes, as a view into the shoe."""
+        if self.remaining() < num_cards:
+            raise ValueError("Not enough cards in the shoe to deal.")
+        dealt = self.codes[self.position : self.position + num_cards]
+        self.position += num_cards
+        return dealt
+
+    def deal_hands(self, num_hands, hand_size=5):
+        """Deal num_hands hands as a (num_hands, hand_size) view of codes."""
+        return self.deal(num_hands * hand_size).reshape(num_hands, hand_size)
+
+    def deal_rounds(self, rounds, num_hands, hand_size=5):
+        """
+        Deal rounds independent deals from freshly shuffled shoes at once.
+
+        Returns a (rounds, num_hands, hand_size) array. Each round is one
+        shuffle of the whole shoe; the shoe's own position is not touched.
+        """
+        dealt_cards = num_hands * hand_size
+        if dealt_cards > len(self.codes):
+            raise ValueError("Not enough cards in the shoe to deal.")
+        decks = np.broadcast_to(self.codes, (rounds, len(self.codes)))
+        shuffled = self.rng.permuted(decks, axis=1)
+        return shuffled[:, :dealt_cards].reshape(rounds, num_hands, hand_size)
+
+    def spawn(self, count):
+        """count new shoes of the same size with independent random streams."""
+        return [Shoe(self.decks, child) for child in self.seed_sequence.spawn(count)]
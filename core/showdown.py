@@ -0,0 +1,89 @@
+from collections import namedtuple
+
+from .encoding import CODE_VALUES
+from .evaluator import (
+    LEAD_SHIFT,
+    VALUE_PRIMES,
+    default_evaluator,
+    solve_wild_hand,
+    solve_wild_lead,
+)
+
+# winner / loser are indexes into the hands passed to showdown(). winners
+# and losers are the exact tie groups for best and worst hand, in seating
+# order. scores only holds the hands that needed a full evaluation; leads
+# holds every hand's rank and lead value (the top bits of its score).
+ShowdownResult = namedtuple(
+    "ShowdownResult", "winner loser winners losers scores leads"
+)
+
+
+def hand_parts(hand, wild_card_value=None):
+    """Non-wild values, wild count and suitedness of a hand of cards."""
+    values = []
+    suits = set()
+    wild_count = 0
+    for card in hand:
+        if card.value == wild_card_value:
+            wild_count += 1
+        else:
+            values.append(CODE_VALUES[card.code])
+        suits.add(card.suit)
+    return values, wild_count, len(suits) == 1
+
+
+def table_score(values, evaluator):
+    """Exact score of an offsuit hand without wild cards, from the tables."""
+    mask = 0
+    product = 1
+    for value in values:
+        mask |= 1 << value
+        product *= VALUE_PRIMES[value]
+    return evaluator.lookup(mask, product, False)
+
+
+def showdown(hands, score_hand=None, wild_card_value=None):
+    """
+    Find the best and worst of any number of hands.
+
+    Each hand first gets its rank and lead value (solve_wild_lead), the top
+    bits of its packed score. Only hands sharing the highest or the lowest
+    lead can be the winner or the loser, so only those are scored in full,
+    with score_hand if given. Cards of wild_card_value are wild.
+
+    Ties for best go to the earliest seat and ties for worst to the latest,
+    matching a stable sort of the scores from best to worst.
+    """
+    if not hands:
+        raise ValueError("showdown needs at least one hand")
+
+    evaluator = default_evaluator() if score_hand is None else None
+    parts = []
+    leads = []
+    scores = {}
+    for index, hand in enumerate(hands):
+        values, wild_count, suited = hand_part = hand_parts(hand, wild_card_value)
+        parts.append(hand_part)
+        if evaluator and not wild_count and not suited:
+            # A table lookup costs no more than the bound, so take the score.
+            scores[index] = table_score(values, evaluator)
+            leads.append(scores[index] >> LEAD_SHIFT)
+        else:
+            leads.append(solve_wild_lead(values, wild_count, suited))
+    top_lead = max(leads)
+    bottom_lead = min(leads)
+
+    for index, lead in enumerate(leads):
+        if lead != top_lead and lead != bottom_lead:
+            scores.pop(index, None)
+        elif index not in scores:
+            if score_hand is None:
+                scores[index] = solve_wild_hand(*parts[index])
+            else:
+                scores[index] = score_hand(hands[index])
+
+    best = max(scores.values())
+    worst = min(scores.values())
+    winners = tuple(index for index in sorted(scores) if scores[index] == best)
+    losers = tuple(index for index in sorted(scores) if scores[index] == worst)
+    return ShowdownResult(winners[0], losers[-1], winners, losers, scores, tuple(leads))
@@ -0,0 +1,229 @@
+"""
+Self-play simulator: many full games of Viuda across all CPU cores.
+
+Games run on ViudaGame with the same chips, side chips and eliminations as
+the game windows, with a bot (core.bots) in every seat. They are split
+into chunks of --chunk-size games, and each chunk gets its own
+SeedSequence child for the deck and the bots.
+The same --seed therefore gives the same report whatever the number of
+workers. Each worker returns only counters, which are merged into one
+report: wins by seat, game length and hand ranks at showdown.
+
+    python -m core.simulate --games 1000000 --players 4 --chips 3
+    python -m core.simulate --games 20000 --bots greedy,random --workers 1
+"""
+
+import argparse
+import os
+import time
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from .card import Deck
+from .evaluator import KICKER_BITS, HandRank
+from .bots import BOTS, DEFAULT_BUDGET, TimedBot, make_bot, observe
+from .encoding import CARD_COUNT
+from .game import GAME_OVER, HAND_SIZE, SIDE_CHIP, ViudaGame
+
+DEFAULT_CHUNK_SIZE = 500
+
+
+class SimulationStats:
+    """Counters for a batch of games; merge() adds another batch."""
+
+    def __init__(self, bot_names):
+        self.bot_names = bot_names  # By seat
+        self.games = 0
+        self.hands = 0
+        self.actions = 0
+        self.timeouts = 0
+        self.wins = [0] * len(bot_names)
+        self.hands_per_game = Counter()
+        self.showdown_ranks = Counter()  # HandRank -> hands shown down
+        self.losing_ranks = Counter()  # HandRank -> hands that paid the table
+
+    def record_hand(self, result):
+        self.hands += 1
+        for lead in result.leads.values():
+            self.showdown_ranks[lead >> KICKER_BITS] += 1
+        self.losing_ranks[result.leads[result.loser] >> KICKER_BITS] += 1
+
+    def record_game(self, winner, hands):
+        self.games += 1
+        self.wins[winner] += 1
+        self.hands_per_game[hands] += 1
+
+    def merge(self, other):
+        self.games += other.games
+        self.hands += other.hands
+        self.actions += other.actions
+        self.timeouts += other.timeouts
+        self.wins = [mine + theirs for mine, theirs in zip(self.wins, other.wins)]
+        self.hands_per_game.update(other.hands_per_game)
+        self.showdown_ranks.update(other.showdown_ranks)
+        self.losing_ranks.update(other.losing_ranks)
+        return self
+
+    def report(self):
+        games = self.games or 1
+        lines = [f"Games: {self.games:,}  Hands: {self.hands:,}"]
+        lines.append(
+            f"Hands per game: {self.hands / games:.2f} average, "
+            f"{min(self.hands_per_game, default=0)}-"
+            f"{max(self.hands_per_game, default=0)}; "
+            f"{self.actions / games:.1f} actions per game"
+        )
+        if self.timeouts:
+            lines.append(f"Bot decisions that timed out: {self.timeouts:,}")
+        lines.append("Wins by seat:")
+        for seat, wins in enumerate(self.wins):
+            lines.append(
+                f"  Player {seat + 1:<3} {self.bot_names[seat]:<10}"
+                f" {wins:>12,} {100.0 * wins / games:8.3f}%"
+            )
+        shown = sum(self.showdown_ranks.values()) or 1
+        losses = sum(self.losing_ranks.values()) or 1
+        lines.append(f"Ranks at showdown: {'shown':>20} {'paid the table':>22}")
+        for rank in sorted(HandRank, reverse=True):
+            count = self.showdown_ranks.get(rank, 0)
+            lost = self.losing_ranks.get(rank, 0)
+            lines.append(
+                f"  {rank.name:<16} {count:>12,} {100.0 * count / shown:8.4f}%"
+                f" {lost:>12,} {100.0 * lost / losses:8.4f}%"
+            )
+        return "\n".join(lines)
+
+
+def play_game(game, bots, stats):
+    """
+    Play game to the end with bots[seat] (TimedBots) deciding for each
+    seat, recording it in stats. Returns the winning seat.
+    """
+    while game.phase != GAME_OVER:
+        game.start_hand()
+        # last_result is set at the showdown; a side chip decision may follow.
+        while game.last_result is None or game.phase == SIDE_CHIP:
+            game.apply(bots[game.current_player].decide(observe(game)).action)
+            stats.actions += 1
+        stats.record_hand(game.last_result)
+    stats.record_game(game.winner, game.hand_number)
+    return game.winner
+
+
+def run_chunk(seed_sequence, games, bot_names, chips, side_chips, budget):
+    """Play one chunk of games; runs in a worker process."""
+    deck_seed, *bot_seeds = seed_sequence.generate_state(
+        1 + len(bot_names), dtype=np.uint64
+    )
+    deck = Deck(seed=int(deck_seed))
+    bots = [
+        TimedBot(make_bot(name, int(bot_seed)), budget)
+        for name, bot_seed in zip(bot_names, bot_seeds)
+    ]
+    stats = SimulationStats(bot_names)
+    for _ in range(games):
+        game = ViudaGame(len(bots), chips=chips, side_chips=side_chips, deck=deck)
+        play_game(game, bots, stats)
+    stats.timeouts = sum(bot.timeouts for bot in bots)
+    return stats
+
+
+def simulate(
+    games,
+    bot_names,
+    chips=1,
+    side_chips=1,
+    budget=DEFAULT_BUDGET,
+    seed=None,
+    workers=None,
+    chunk_size=DEFAULT_CHUNK_SIZE,
+):
+    """
+    Play games full games across workers processes, with make_bot(name)
+    in each seat of bot_names, and merge the stats.
+    """
+    chunk_sizes = [chunk_size] * (games // chunk_size)
+    if games % chunk_size:
+        chunk_sizes.append(games % chunk_size)
+    seeds = np.random.SeedSequence(seed).spawn(len(chunk_sizes))
+    jobs = [
+        (chunk_seed, size, bot_names, chips, side_chips, budget)
+        for chunk_seed, size in zip(seeds, chunk_sizes)
+    ]
+
+    stats = SimulationStats(bot_names)
+    workers = workers or os.cpu_count() or 1
+    if workers == 1:
+        for job in jobs:
+            stats.merge(run_chunk(*job))
+        return stats
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        for chunk_stats in pool.map(run_chunk, *zip(*jobs)):
+            stats.merge(chunk_stats)
+    return stats
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--games", type=int, default=10000)
+    parser.add_argument("--players", type=int, default=3)
+    parser.add_argument(
+        "--chips", type=int, default=1, help="starting chips per player"
+    )
+    parser.add_argument("--side-chips", type=int, default=1)
+    parser.add_argument(
+        "--bots",
+        default="greedy",
+        help=f"comma-separated bot for each seat, or one for all ({', '.join(BOTS)})",
+    )
+    parser.add_argument(
+        "--budget",
+        type=float,
+        default=DEFAULT_BUDGET,
+        help="seconds per bot decision",
+    )
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument(
+        "--workers", type=int, default=0, help="processes to use (0: every core)"
+    )
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE)
+    args = parser.parse_args()
+
+    bot_names = [name for name in args.bots.split(",") if name]
+    if len(bot_names) == 1:
+        bot_names *= args.players
+    if len(bot_names) != args.players:
+        parser.error(f"--bots needs one bot or {args.players}")
+    for name in bot_names:
+        if name not in BOTS:
+            parser.error(f"unknown bot: {name}")
+    if args.players < 2:
+        parser.error("Viuda needs at least two players")
+    if (args.players + 1) * HAND_SIZE > CARD_COUNT:
+        parser.error(f"one deck deals at most {CARD_COUNT // HAND_SIZE - 1} players")
+    if args.chunk_size < 1:
+        parser.error("--chunk-size must be at least 1")
+
+    start = time.perf_counter()
+    stats = simulate(
+        args.games,
+        bot_names,
+        chips=args.chips,
+        side_chips=args.side_chips,
+        budget=args.budget,
+        seed=args.seed,
+        workers=args.workers,
+        chunk_size=args.chunk_size,
+    )
+    elapsed = time.perf_counter() - start
+    print(stats.report())
+    print(
+        f"{elapsed:.1f}s: {stats.games / elapsed:,.0f} games/s, "
+        f"{stats.hands / elapsed:,.0f} hands/s"
+    )
+
+
+if __name__ == "__main__":
+    main()
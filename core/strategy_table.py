@@ -0,0 +1,410 @@
+"""
+Strategy table: a precomputed policy for the common decisions, solved offline.
+
+A decision is reduced to an information set of five small numbers: whether
+the reveal cards are up, whether someone has called, how many players are
+still in, how many wild cards the hand holds and its strength bucket (the
+decile of all 5-card hands it beats, from core.percentile). In each one a
+player picks an abstract action: pass, call, or draw (reveal while the
+reveal cards are down, afterwards the exchange or swap that most raises
+the hand's rank and lead value; see draw_action).
+
+The solver plays single hands on ViudaGame with external sampling Monte
+Carlo counterfactual regret minimization: one seat explores every abstract
+action at its own turns, the others sample from the current regret-matched
+strategy, and paying the table scores -1. The average strategy goes to a
+raw float32 file with a JSON index next to it, like the card atlas:
+
+    python -m core.strategy_table --iterations 200000 --seed 1
+
+StrategyTable maps that file read-only with numpy.memmap, so loading it is
+instant, every process shares the same pages and a decision is one row
+lookup. TableBot plays from it.
+"""
+
+import argparse
+import json
+import logging
+import math
+import os
+import random
+import time
+
+from viuda_card_config import CACHE_DIR
+
+from .bot_base import Bot
+from .card import Deck
+from .evaluator import default_evaluator
+from .game import (
+    ACTIVE,
+    CALL_ACTION,
+    EXCHANGE_ACTION,
+    PASS_ACTION,
+    PLAYING,
+    REVEAL_ACTION,
+    SIDE_CHIP,
+    SWAP_ACTIONS,
+    TAKE_SIDE_CHIP_ACTION,
+    ViudaGame,
+)
+from .ismcts import hand_lead
+from .percentile import default_percentiles
+
+STRATEGY_TABLE_VERSION = 1
+STRATEGY_TABLE_PATH = os.path.join(CACHE_DIR, "strategy_table.f32")
+STRATEGY_INDEX_PATH = os.path.join(CACHE_DIR, "strategy_table.json")
+
+# Abstract actions, in the order of the table's last axis.
+PASS, CALL, DRAW = range(3)
+ABSTRACT_ACTIONS = ("pass", "call", "draw")
+
+STRENGTH_BUCKETS = 10
+MAX_WILDS = 4  # Wild cards one hand can hold
+MIN_PLAYERS = 2
+MAX_PLAYERS = 9  # (players + 1) hands of 5 must fit in one deck
+
+# Table axes: revealed, call made, players - MIN_PLAYERS, wild cards,
+# strength bucket, abstract action.
+TABLE_SHAPE = (
+    2,
+    2,
+    MAX_PLAYERS - MIN_PLAYERS + 1,
+    MAX_WILDS + 1,
+    STRENGTH_BUCKETS,
+    len(ABSTRACT_ACTIONS),
+)
+INFO_SETS = math.prod(TABLE_SHAPE[:-1])
+
+# The solving seat branches on its first few turns of a hand only; later
+# turns (rare, after long runs of draws) are sampled like everyone else's.
+MAX_BRANCH_TURNS = 3
+
+
+def info_set(hand, wild_card_value, players, revealed, call_made):
+    """Row of the table (0 to INFO_SETS - 1) for one decision."""
+    score = default_evaluator().evaluate(hand, wild_card_value)
+    beats = default_percentiles().beats(score, wild_card_value)
+    bucket = min(int(beats * STRENGTH_BUCKETS), STRENGTH_BUCKETS - 1)
+    wilds = min(sum(card.value == wild_card_value for card in hand), MAX_WILDS)
+    players = min(max(players, MIN_PLAYERS), MAX_PLAYERS) - MIN_PLAYERS
+    row = (revealed * 2 + call_made) * TABLE_SHAPE[2] + players
+    return (row * TABLE_SHAPE[3] + wilds) * STRENGTH_BUCKETS + bucket
+
+
+def draw_action(hand, reveal_cards, wild_card_value, revealed):
+    """
+    The concrete move behind DRAW: reveal, or else the exchange or swap
+    that most raises the hand's rank and lead value. None when no move
+    improves the hand, which makes DRAW unavailable.
+    """
+    if not revealed:
+        return REVEAL_ACTION
+    best_lead = hand_lead(hand, wild_card_value)
+    best = None
+    if hand_lead(reveal_cards, wild_card_value) > best_lead:
+        best_lead = hand_lead(reveal_cards, wild_card_value)
+        best = EXCHANGE_ACTION
+    swapped = list(hand)
+    for swap in SWAP_ACTIONS:
+        swapped[swap.hand_index] = reveal_cards[swap.reveal_index]
+        lead = hand_lead(swapped, wild_card_value)
+        if lead > best_lead:
+            best_lead = lead
+            best = swap
+        swapped[swap.hand_index] = hand[swap.hand_index]
+    return best
+
+
+def abstract_moves(hand, reveal_cards, wild_card_value, revealed, call_made):
+    """{abstract action: concrete Action} for the moves available."""
+    moves = {PASS: PASS_ACTION}
+    if not call_made:
+        moves[CALL] = CALL_ACTION
+    draw = draw_action(hand, reveal_cards, wild_card_value, revealed)
+    if draw is not None:
+        moves[DRAW] = draw
+    return moves
+
+
+def regret_matching(regrets, moves):
+    """Strategy over moves in proportion to positive regret, else uniform."""
+    positive = [max(regrets[action], 0.0) for action in moves]
+    total = sum(positive)
+    if total > 0:
+        return [weight / total for weight in positive]
+    return [1.0 / len(moves)] * len(moves)
+
+
+def sample(rng, weights):
+    point = rng.random()
+    for index, weight in enumerate(weights):
+        point -= weight
+        if point < 0:
+            return index
+    return len(weights) - 1
+
+
+class StrategySolver:
+    """Regret and average strategy sums for every information set."""
+
+    def __init__(self, seed=None, player_counts=range(MIN_PLAYERS, MAX_PLAYERS + 1)):
+        self.rng = random.Random(seed)
+        self.deck = Deck(seed=self.rng.getrandbits(64))
+        self.player_counts = list(player_counts)
+        self.regrets = [[0.0] * len(ABSTRACT_ACTIONS) for _ in range(INFO_SETS)]
+        self.strategy_sums = [[0.0] * len(ABSTRACT_ACTIONS) for _ in range(INFO_SETS)]
+        self.iterations = 0
+        self.nodes = 0
+        default_evaluator()
+        default_percentiles()
+
+    def iterate(self):
+        """Deal one hand and update the regrets of one of its seats."""
+        rng = self.rng
+        game = ViudaGame(
+            rng.choice(self.player_counts),
+            table_chips=rng.randint(1, 13),
+            deck=self.deck,
+        )
+        game.start_hand()
+        self.traverse(game, rng.randrange(game.num_players), 0)
+        self.iterations += 1
+
+    def traverse(self, game, solver_seat, turns):
+        """Expected table payment for solver_seat (0 or -1) from game on."""
+        while game.phase == PLAYING:
+            self.nodes += 1
+            seat = game.current_player
+            hand = game.hands[seat]
+            wild = game.wild.value
+            key = info_set(hand, wild, game.active_count, game.revealed, game.call_made)
+            moves = abstract_moves(
+                hand, game.reveal_cards, wild, game.revealed, game.call_made
+            )
+            strategy = regret_matching(self.regrets[key], moves)
+
+            if seat == solver_seat and turns < MAX_BRANCH_TURNS:
+                values = []
+                for action in moves.values():
+                    child = game.clone()
+                    child.apply(action)
+                    values.append(self.traverse(child, solver_seat, turns + 1))
+                expected = sum(p * value for p, value in zip(strategy, values))
+                regrets = self.regrets[key]
+                for action, value in zip(moves, values):
+                    regrets[action] += value - expected
+                return expected
+
+            if seat == solver_seat:
+                turns += 1
+            else:
+                sums = self.strategy_sums[key]
+                for action, p in zip(moves, strategy):
+                    sums[action] += p
+            actions = list(moves.values())
+            game.apply(actions[sample(self.rng, strategy)])
+        return -1.0 if game.last_result.loser == solver_seat else 0.0
+
+    def average_strategy(self):
+        """Normalized average strategy, uniform in information sets never reached."""
+        import numpy as np
+
+        sums = np.asarray(self.strategy_sums, dtype=np.float64)
+        totals = sums.sum(axis=1, keepdims=True)
+        uniform = np.full_like(sums, 1.0 / len(ABSTRACT_ACTIONS))
+        average = np.divide(sums, totals, out=uniform, where=totals > 0)
+        return average.astype(np.float32).reshape(TABLE_SHAPE)
+
+
+def write_strategy_table(
+    strategy, info, table_path=STRATEGY_TABLE_PATH, index_path=STRATEGY_INDEX_PATH
+):
+    """
+    Write a TABLE_SHAPE float32 array and its JSON index. Both go to
+    temporary files first, so running bots never map a half-written table.
+    """
+    import numpy as np
+
+    os.makedirs(os.path.dirname(table_path) or ".", exist_ok=True)
+    table_file = np.memmap(
+        f"{table_path}.tmp", dtype=np.float32, mode="w+", shape=TABLE_SHAPE
+    )
+    table_file[:] = strategy
+    table_file.flush()
+    del table_file
+    index = {
+        "version": STRATEGY_TABLE_VERSION,
+        "table": os.path.basename(table_path),
+        "shape": list(TABLE_SHAPE),
+        "actions": list(ABSTRACT_ACTIONS),
+        **info,
+    }
+    with open(f"{index_path}.tmp", "w") as index_file:
+        json.dump(index, index_file, indent=1)
+    os.replace(f"{table_path}.tmp", table_path)
+    os.replace(f"{index_path}.tmp", index_path)
+    return index
+
+
+class StrategyTable:
+    """The solved policy, memory-mapped read-only; see the module docstring."""
+
+    def __init__(self, table_path=STRATEGY_TABLE_PATH, index_path=STRATEGY_INDEX_PATH):
+        with open(index_path) as index_file:
+            self.index = json.load(index_file)
+        if self.index.get("version") != STRATEGY_TABLE_VERSION or self.index.get(
+            "shape"
+        ) != list(TABLE_SHAPE):
+            raise ValueError(
+                f"Strategy table at {table_path} is out of date; "
+                "rerun python -m core.strategy_table"
+            )
+        import numpy as np
+
+        self.table = np.memmap(
+            table_path,
+            dtype=np.float32,
+            mode="r",
+            shape=(INFO_SETS, len(ABSTRACT_ACTIONS)),
+        )
+
+    def policy(self, key, moves):
+        """Probabilities for moves (abstract actions) in information set key."""
+        row = self.table[key]
+        weights = [float(row[action]) for action in moves]
+        total = sum(weights)
+        if total > 0:
+            return [weight / total for weight in weights]
+        return [1.0 / len(moves)] * len(moves)
+
+
+_default_table = None
+
+
+def default_strategy_table():
+    """Shared StrategyTable, or None if none has been solved yet."""
+    global _default_table
+    if _default_table is None:
+        try:
+            _default_table = StrategyTable()
+        except (OSError, ValueError) as e:
+            logging.warning(f"Strategy table unavailable, playing uniformly: {e}")
+            _default_table = False
+    return _default_table or None
+
+
+class TableBot(Bot):
+    """
+    Plays from the strategy table: one lookup and a sample per decision,
+    plus the draw move once the reveal cards are up. Without a solved
+    table every available abstract action is equally likely.
+    """
+
+    name = "table"
+
+    def __init__(self, seed=None, table=None):
+        super().__init__(seed)
+        self.table = table if table is not None else default_strategy_table()
+        default_evaluator()
+        default_percentiles()
+
+    def choose(self, observation, deadline):
+        if observation.phase == SIDE_CHIP:
+            return TAKE_SIDE_CHIP_ACTION
+        hand = observation.hand
+        wild = observation.wild_value
+        moves = abstract_moves(
+            hand,
+            observation.reveal_cards,
+            wild,
+            observation.revealed,
+            observation.call_made,
+        )
+        if self.table is None:
+            weights = [1.0 / len(moves)] * len(moves)
+        else:
+            key = info_set(
+                hand,
+                wild,
+                observation.statuses.count(ACTIVE),
+                observation.revealed,
+                observation.call_made,
+            )
+            weights = self.table.policy(key, moves)
+        return list(moves.values())[sample(self.rng, weights)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--iterations", type=int, default=100000)
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument(
+        "--players",
+        default=f"{MIN_PLAYERS}-{MAX_PLAYERS}",
+        help="player counts to deal hands for, as N or MIN-MAX",
+    )
+    parser.add_argument("--out", default=STRATEGY_TABLE_PATH, help="table file")
+    args = parser.parse_args()
+
+    low, _, high = args.players.partition("-")
+    player_counts = range(int(low), int(high or low) + 1)
+    if player_counts.start < MIN_PLAYERS or player_counts.stop > MAX_PLAYERS + 1:
+        parser.error(f"players must be between {MIN_PLAYERS} and {MAX_PLAYERS}")
+    index_path = os.path.splitext(args.out)[0] + ".json"
+
+    solver = StrategySolver(args.seed, player_counts)
+    start = time.perf_counter()
+    report_every = max(1, args.iterations // 10)
+    for iteration in range(1, args.iterations + 1):
+        solver.iterate()
+        if iteration % report_every == 0:
+            elapsed = time.perf_counter() - start
+            print(
+                f"{iteration:>10,} hands {elapsed:8.1f}s "
+                f"({iteration / elapsed:,.0f} hands/s, "
+                f"{solver.nodes / elapsed:,.0f} decisions/s)"
+            )
+    elapsed = time.perf_counter() - start
+
+    strategy = solver.average_strategy()
+    write_strategy_table(
+        strategy,
+        {
+            "iterations": solver.iterations,
+            "seed": args.seed,
+            "players": [player_counts.start, player_counts.stop - 1],
+            "seconds": round(elapsed, 1),
+        },
+        args.out,
+        index_path,
+    )
+    print(f"Wrote {args.out} and {index_path}")
+
+    # Summary: the average policy by reveal and call state and strength,
+    # weighted by how often each information set came up.
+    import numpy as np
+
+    reached = np.asarray(solver.strategy_sums).sum(axis=1).reshape(TABLE_SHAPE[:-1])
+    print(f"{'':<22}" + "".join(f"{name:>7}" for name in ABSTRACT_ACTIONS))
+    for revealed in (0, 1):
+        for call_made in (0, 1):
+            for bucket in range(0, STRENGTH_BUCKETS, 3):
+                weights = reached[revealed, call_made, :, :, bucket].reshape(-1)
+                if not weights.sum():
+                    continue
+                policy = strategy[revealed, call_made, :, :, bucket].reshape(
+                    -1, len(ABSTRACT_ACTIONS)
+                )
+                label = (
+                    f"{'up' if revealed else 'down'}{', called' if call_made else ''}"
+                )
+                print(
+                    f"  {label:<12} decile {bucket}"
+                    + "".join(
+                        f"{p:7.3f}" for p in np.average(policy, axis=0, weights=weights)
+                    )
+                )
+
+
+if __name__ == "__main__":
+    main()
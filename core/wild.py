@@ -0,0 +1,50 @@
+from viuda_card_config import REVERSE_VALUE_DICT
+
+
+def wild_card_number(table_chips):
+    """The wild card number (1-13, 1 is the ace) for a table chip count."""
+    return ((table_chips - 1) % 13) + 1
+
+
+def wild_card_value_for(table_chips):
+    """The wild card value string ('A', '2', ..., 'K') for a table chip count."""
+    return REVERSE_VALUE_DICT[wild_card_number(table_chips)]
+
+
+class WildContext:
+    """
+    The current wild card value of one game.
+
+    The deck, dealer, evaluators and card widgets all read it from here, so
+    a card is wild when its value equals value; nothing is stored per card.
+    Listeners are called as listener(old_value, new_value) only when the
+    value actually changes.
+    """
+
+    def __init__(self, value=None):
+        self.value = value
+        self.listeners = []
+
+    def add_listener(self, listener):
+        self.listeners.append(listener)
+
+    def is_wild(self, card):
+        return card.value == self.value
+
+    def set_value(self, value):
+        """Set the wild card value. Returns True if it changed."""
+        if value == self.value:
+            return False
+        old_value = self.value
+        self.value = value
+        for listener in self.listeners:
+            listener(old_value, value)
+        return True
+
+    def update_from_table_chips(self, table_chips):
+        return self.set_value(wild_card_value_for(table_chips))
+
+    @staticmethod
+    def flipped(card, old_value, new_value):
+        """True if the card's wild state differs between the two values."""
+        return card.value in (old_value, new_value) and old_value != new_value
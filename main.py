@@ -5,6 +5,8 @@ import logging
 from PyQt5.QtWidgets import QApplication, QDialog
 
 # Import our main window and the dialog from the UI module
+from core.bots import make_bot
+from ui.card_preloader import start_card_preloader
 from ui.game_window import GameWindow, PlayerNamesDialog
 
 
@@ -17,6 +19,9 @@ def main():
     logging.info("Starting the game application.")
 
     app = QApplication([])
+    # Decode the card images in the background while the player names are
+    # entered; cards show placeholders until their images are ready.
+    start_card_preloader()
 
     num_players = 3
 
@@ -24,10 +29,11 @@ def main():
     dialog = PlayerNamesDialog(num_players)
     if dialog.exec_() == QDialog.Accepted:
         player_names = dialog.player_names
+        bots = {seat: make_bot(name) for seat, name in dialog.bot_names.items()}
     else:
         sys.exit(0)
 
-    game_window = GameWindow(app, num_players, player_names)
+    game_window = GameWindow(app, num_players, player_names, bots=bots)
     game_window.start_first_hand()
 
     def exception_hook(exctype, value, tb):
@@ -0,0 +1,278 @@
+"""
+Card texture atlas: every image in graphics/cards packed into one PNG.
+
+The build step writes the atlas and a JSON index of where each image
+sits, and optionally the atlas as raw RGBA bytes for headless rendering:
+
+    python -m ui.card_atlas
+    python -m ui.card_atlas --cell 160x244 --raw
+
+Every face also gets a pre-rendered wild variant with a red border,
+stored under wild_id(card_id). CardAtlas decodes the atlas once and hands
+out sub-pixmaps by id ("AS", "AS+wild", "default", ...). The atlas is
+rebuilt when the index is missing or any source image has changed.
+"""
+
+import argparse
+import json
+import logging
+import os
+
+from PyQt5.QtCore import QRect, Qt
+from PyQt5.QtGui import QImage, QPainter, QPixmap
+
+from viuda_card_config import CACHE_DIR
+
+CARD_IMAGE_DIR = "graphics/cards"
+ATLAS_VERSION = 2
+ATLAS_IMAGE_PATH = os.path.join(CACHE_DIR, "card_atlas.png")
+ATLAS_INDEX_PATH = os.path.join(CACHE_DIR, "card_atlas.json")
+ATLAS_RAW_PATH = os.path.join(CACHE_DIR, "card_atlas.rgba")
+
+# Cards are shown at 50x80; cells this size still look sharp at 2x and
+# 3x device pixel ratios while keeping the atlas under 20 MB decoded.
+ATLAS_CELL_SIZE = (160, 244)
+ATLAS_COLUMNS = 8
+
+CARD_BACK_PREFIX = "default"  # default.png, default0.png, ... are card backs
+WILD_SUFFIX = "+wild"
+# Wild cards used to get a 2 px stylesheet border on their 50 px wide
+# label; the pre-rendered border keeps that width when shown at 50 px.
+WILD_BORDER_RATIO = 2 / 50
+
+
+def wild_id(card_id):
+    return f"{card_id}{WILD_SUFFIX}"
+
+
+def add_wild_border(device):
+    """Paint the red wild card border onto a QImage or QPixmap."""
+    width = device.width()
+    height = device.height()
+    if not width or not height:
+        return
+    border = max(1, round(width * WILD_BORDER_RATIO))
+    painter = QPainter(device)
+    painter.fillRect(0, 0, width, border, Qt.red)
+    painter.fillRect(0, height - border, width, border, Qt.red)
+    painter.fillRect(0, 0, border, height, Qt.red)
+    painter.fillRect(width - border, 0, border, height, Qt.red)
+    painter.end()
+
+
+def source_images(image_dir=CARD_IMAGE_DIR):
+    """Card id -> (path, mtime_ns, size) for every PNG in image_dir."""
+    sources = {}
+    for name in sorted(os.listdir(image_dir)):
+        card_id, extension = os.path.splitext(name)
+        if extension.lower() != ".png":
+            continue
+        path = os.path.join(image_dir, name)
+        stat = os.stat(path)
+        sources[card_id] = (path, stat.st_mtime_ns, stat.st_size)
+    return sources
+
+
+def build_atlas(
+    image_dir=CARD_IMAGE_DIR,
+    image_path=ATLAS_IMAGE_PATH,
+    index_path=ATLAS_INDEX_PATH,
+    raw_path=None,
+    cell_size=ATLAS_CELL_SIZE,
+):
+    """Pack every card image into one atlas and write it with its index."""
+    sources = source_images(image_dir)
+    images = {}
+    for card_id, (path, _, _) in sources.items():
+        image = QImage(path)
+        if image.isNull():
+            logging.warning(f"Card atlas: could not decode {path}, skipping it")
+            continue
+        images[card_id] = image.scaled(
+            *cell_size,
+            Qt.AspectRatioMode.KeepAspectRatio,
+            Qt.TransformationMode.SmoothTransformation,
+        )
+    for card_id in list(images):
+        if not card_id.startswith(CARD_BACK_PREFIX):
+            wild_image = images[card_id].copy()
+            add_wild_border(wild_image)
+            images[wild_id(card_id)] = wild_image
+
+    cell_width, cell_height = cell_size
+    rows = -(-len(images) // ATLAS_COLUMNS)
+    atlas = QImage(
+        cell_width * ATLAS_COLUMNS, cell_height * rows, QImage.Format_RGBA8888
+    )
+    atlas.fill(Qt.transparent)
+
+    rects = {}
+    painter = QPainter(atlas)
+    for position, (card_id, image) in enumerate(images.items()):
+        x = (position % ATLAS_COLUMNS) * cell_width
+        y = (position // ATLAS_COLUMNS) * cell_height
+        painter.drawImage(x, y, image)
+        rects[card_id] = [x, y, image.width(), image.height()]
+    painter.end()
+
+    os.makedirs(os.path.dirname(image_path) or ".", exist_ok=True)
+    if not atlas.save(image_path, "PNG"):
+        raise OSError(f"Could not write card atlas to {image_path}")
+    if raw_path:
+        with open(raw_path, "wb") as raw_file:
+            raw_file.write(atlas.constBits().asstring(atlas.sizeInBytes()))
+
+    index = {
+        "version": ATLAS_VERSION,
+        "image": os.path.basename(image_path),
+        "raw": os.path.basename(raw_path) if raw_path else None,
+        "size": [atlas.width(), atlas.height()],
+        "cells": rects,
+        "sources": {
+            card_id: [mtime, size] for card_id, (_, mtime, size) in sources.items()
+        },
+    }
+    with open(index_path, "w") as index_file:
+        json.dump(index, index_file, indent=1)
+    return index
+
+
+def atlas_is_current(index, image_dir=CARD_IMAGE_DIR):
+    if index.get("version") != ATLAS_VERSION:
+        return False
+    sources = {
+        card_id: [mtime, size]
+        for card_id, (_, mtime, size) in source_images(image_dir).items()
+    }
+    return index.get("sources") == sources
+
+
+def load_atlas_index(
+    image_dir=CARD_IMAGE_DIR,
+    image_path=ATLAS_IMAGE_PATH,
+    index_path=ATLAS_INDEX_PATH,
+):
+    """
+    Read the atlas index, building the atlas first if it is missing or
+    stale. A rebuild rewrites the raw RGBA file too if the old atlas had one.
+    """
+    raw_path = None
+    try:
+        with open(index_path) as index_file:
+            index = json.load(index_file)
+        if atlas_is_current(index, image_dir) and os.path.exists(image_path):
+            return index
+        logging.info(f"Card atlas at {image_path} is out of date. Rebuilding.")
+        raw = index.get("raw")
+        if raw:
+            raw_path = os.path.join(os.path.dirname(image_path), raw)
+    except (OSError, ValueError):
+        logging.info(f"No usable card atlas at {image_path}. Building it.")
+    return build_atlas(image_dir, image_path, index_path, raw_path)
+
+
+class CardAtlas:
+    """
+    One decoded atlas image and the cell of every card in it.
+
+    pixmap() needs a QGuiApplication; raw_rgba() and card_rgba() only need
+    numpy and an atlas built with raw=True.
+    """
+
+    def __init__(
+        self,
+        image_dir=CARD_IMAGE_DIR,
+        image_path=ATLAS_IMAGE_PATH,
+        index_path=ATLAS_INDEX_PATH,
+    ):
+        self.image_path = image_path
+        self.index = load_atlas_index(image_dir, image_path, index_path)
+        self.cells = {
+            card_id: QRect(*rect) for card_id, rect in self.index["cells"].items()
+        }
+        raw = self.index.get("raw")
+        self.raw_path = os.path.join(os.path.dirname(image_path), raw) if raw else None
+        self.atlas_pixmap = None
+        self.raw = None
+
+    def __contains__(self, card_id):
+        return card_id in self.cells
+
+    def pixmap(self, card_id):
+        """Sub-pixmap for one card id, cut from the atlas decoded on first use."""
+        if self.atlas_pixmap is None:
+            self.atlas_pixmap = QPixmap(self.image_path)
+        return self.atlas_pixmap.copy(self.cells[card_id])
+
+    def raw_rgba(self):
+        """The whole atlas as a read-only (height, width, 4) uint8 memmap."""
+        if self.raw is None:
+            if not self.raw_path or not os.path.exists(self.raw_path):
+                raise FileNotFoundError(
+                    "Card atlas has no raw RGBA file; rebuild it with --raw"
+                )
+            import numpy as np
+
+            width, height = self.index["size"]
+            self.raw = np.memmap(
+                self.raw_path, dtype=np.uint8, mode="r", shape=(height, width, 4)
+            )
+        return self.raw
+
+    def card_rgba(self, card_id):
+        """(height, width, 4) view of one card in the raw atlas."""
+        rect = self.cells[card_id]
+        return self.raw_rgba()[
+            rect.y() : rect.y() + rect.height(), rect.x() : rect.x() + rect.width()
+        ]
+
+
+_default_atlas = None
+
+
+def default_atlas():
+    """Shared CardAtlas, or None if it cannot be built (images fall back to files)."""
+    global _default_atlas
+    if _default_atlas is None:
+        try:
+            _default_atlas = CardAtlas()
+        except OSError as e:
+            logging.warning(f"Card atlas unavailable, loading card files: {e}")
+            _default_atlas = False
+    return _default_atlas or None
+
+
+def parse_cell_size(text):
+    width, height = text.lower().split("x")
+    return int(width), int(height)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--images", default=CARD_IMAGE_DIR, help="card image folder")
+    parser.add_argument(
+        "--cell",
+        type=parse_cell_size,
+        default=ATLAS_CELL_SIZE,
+        help="cell size as WIDTHxHEIGHT (default %(default)s)",
+    )
+    parser.add_argument(
+        "--raw",
+        action="store_true",
+        help=f"also write raw RGBA to {ATLAS_RAW_PATH} for headless use",
+    )
+    args = parser.parse_args()
+
+    index = build_atlas(
+        args.images,
+        raw_path=ATLAS_RAW_PATH if args.raw else None,
+        cell_size=args.cell,
+    )
+    width, height = index["size"]
+    print(
+        f"Packed {len(index['cells'])} images into {ATLAS_IMAGE_PATH} ({width}x{height})"
+    )
+
+
+if __name__ == "__main__":
+    main()
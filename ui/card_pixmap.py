@@ -0,0 +1,193 @@
+import os
+from collections import OrderedDict
+from PyQt5.QtCore import Qt
+from PyQt5.QtGui import QColor, QPainter, QPixmap
+from ui.card_atlas import CARD_IMAGE_DIR, add_wild_border, default_atlas, wild_id
+from ui.scaled_card_cache import default_scaled_cache, display_scale
+
+CARD_BACK_ID = "default"
+CARD_SIZE = (50, 80)
+
+# Full-size card images are up to 3 MB each once decoded (150 KB from the
+# atlas) and the 50x80 ones about 16 KB, so they get separate budgets: a
+# handful of full-size images must not push every small variant out.
+DEFAULT_PIXMAP_CACHE_BYTES = 8 * 1024 * 1024
+DEFAULT_SOURCE_CACHE_BYTES = 48 * 1024 * 1024
+
+
+def pixmap_bytes(pixmap):
+    return pixmap.width() * pixmap.height() * max(pixmap.depth(), 8) // 8
+
+
+class PixmapCache:
+    """
+    LRU of decoded card pixmaps, bounded by their total size in bytes.
+
+    Keys are (card id, face up, wild, size), with size None for the image
+    at its original resolution. Each asset is decoded and each scaled or
+    wild-bordered variant built once, until it is evicted as the least
+    recently used once the total goes over max_bytes.
+    """
+
+    def __init__(self, max_bytes=DEFAULT_PIXMAP_CACHE_BYTES):
+        self.max_bytes = max_bytes
+        self.entries = OrderedDict()
+        self.bytes_used = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key, build):
+        """Return the pixmap stored under key, calling build() on a miss."""
+        pixmap = self.entries.get(key)
+        if pixmap is not None:
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return pixmap
+
+        self.misses += 1
+        pixmap = build()
+        self.put(key, pixmap)
+        return pixmap
+
+    def put(self, key, pixmap):
+        size = pixmap_bytes(pixmap)
+        if size > self.max_bytes or is_placeholder(pixmap):
+            return
+        if key in self.entries:
+            self.bytes_used -= pixmap_bytes(self.entries.pop(key))
+        while self.entries and self.bytes_used + size > self.max_bytes:
+            _, evicted = self.entries.popitem(last=False)
+            self.bytes_used -= pixmap_bytes(evicted)
+            self.evictions += 1
+        self.entries[key] = pixmap
+        self.bytes_used += size
+
+    def __contains__(self, key):
+        return key in self.entries
+
+    def clear(self):
+        self.entries.clear()
+        self.bytes_used = 0
+
+    def stats(self):
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "size": len(self.entries),
+            "bytes": self.bytes_used,
+            "max_bytes": self.max_bytes,
+        }
+
+
+# Shared by every window: scaled variants, and full-size images.
+pixmap_cache = PixmapCache()
+source_pixmap_cache = PixmapCache(DEFAULT_SOURCE_CACHE_BYTES)
+
+# True while ui.card_preloader decodes the images on its worker thread.
+# Cards whose image has not arrived yet get a placeholder instead of
+# being decoded on the GUI thread.
+preloading = False
+_placeholders = {}
+
+
+def placeholder_pixmap(size=None):
+    """Plain card-sized stand-in, shared per size and never cached as a card."""
+    size = size or CARD_SIZE
+    pixmap = _placeholders.get(size)
+    if pixmap is None:
+        pixmap = QPixmap(*size)
+        pixmap.fill(QColor("lightgray"))
+        painter = QPainter(pixmap)
+        painter.setPen(QColor("gray"))
+        painter.drawRect(0, 0, size[0] - 1, size[1] - 1)
+        painter.end()
+        _placeholders[size] = pixmap
+    return pixmap
+
+
+def is_placeholder(pixmap):
+    return any(pixmap is placeholder for placeholder in _placeholders.values())
+
+
+def card_pixmap_key(card, face_up=True, is_wild=False, size=None):
+    """Cache key for how a card currently looks. All card backs share one key."""
+    if not face_up:
+        return (CARD_BACK_ID, False, False, size)
+    return (card.id, True, bool(is_wild), size)
+
+
+def build_card_pixmap(key):
+    card_id, face_up, is_wild, size = key
+    if size is not None:
+        scaled_cache = default_scaled_cache()
+        if scaled_cache is not None:
+            pixmap = scaled_cache.pixmap(card_id, is_wild, size, display_scale())
+            if pixmap is not None:
+                return pixmap
+        source = cached_card_pixmap((card_id, face_up, is_wild, None))
+        if is_placeholder(source):
+            # The image is still being decoded: the next lookup builds it.
+            return placeholder_pixmap(size)
+        return source.scaled(*size, Qt.AspectRatioMode.KeepAspectRatio)
+    atlas = default_atlas()
+    if is_wild:
+        if atlas is not None and wild_id(card_id) in atlas:
+            return atlas.pixmap(wild_id(card_id))
+        # No atlas: paint once on a copy so the cached plain face keeps no border.
+        source = cached_card_pixmap((card_id, face_up, False, None))
+        if is_placeholder(source):
+            return source
+        pixmap = QPixmap(source)
+        add_wild_border(pixmap)
+        return pixmap
+    if atlas is not None and card_id in atlas:
+        return atlas.pixmap(card_id)
+    return QPixmap(os.path.join(CARD_IMAGE_DIR, f"{card_id}.png"))
+
+
+def can_build_without_decoding(key):
+    """True if the pixmap for key needs no full-size image decoded."""
+    card_id, face_up, is_wild, size = key
+    if (card_id, face_up, is_wild, None) in source_pixmap_cache:
+        return True
+    scaled_cache = default_scaled_cache()
+    return (
+        size is not None
+        and scaled_cache is not None
+        and scaled_cache.contains(card_id, is_wild, size, display_scale())
+    )
+
+
+def cached_card_pixmap(key):
+    cache = source_pixmap_cache if key[3] is None else pixmap_cache
+    if preloading and key not in cache and not can_build_without_decoding(key):
+        return placeholder_pixmap(key[3])
+    return cache.get(key, lambda: build_card_pixmap(key))
+
+
+def card_pixmap(card, face_up=True, is_wild=False):
+    """
+    Pixmap for a core.card.Card as it lies: the card back when face down,
+    otherwise its face with a red border if is_wild (ask the game's
+    WildContext).
+    """
+    return cached_card_pixmap(card_pixmap_key(card, face_up, is_wild))
+
+
+def scaled_card_pixmap(
+    card, face_up=True, is_wild=False, width=CARD_SIZE[0], height=CARD_SIZE[1]
+):
+    return cached_card_pixmap(card_pixmap_key(card, face_up, is_wild, (width, height)))
+
+
+def highlight_wild_card(card_label, is_face_up):
+    """
+    Show a face-up wild card with its pre-rendered wild artwork.
+
+    This used to set a border stylesheet on the label; now it is a cached
+    pixmap swap, so refreshing labels after the wild value rotates is cheap.
+    """
+    if card_label is not None and hasattr(card_label, "card") and is_face_up:
+        card_label.update_card_image()
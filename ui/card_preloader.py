@@ -0,0 +1,169 @@
+"""
+Background decoding of the card images at startup.
+
+start_card_preloader() reads the card atlas (or, without one, every PNG in
+graphics/cards) with QImageReader on a worker thread. The decoded QImages
+come back to the GUI thread in small batches, which turn them into
+pixmaps in ui.card_pixmap's source cache. Until then card widgets show
+placeholders, so windows can appear before any image is decoded. The
+worker then writes any missing pre-scaled images (ui.scaled_card_cache).
+Once everything is in, every CardWidget repaints with its real image.
+"""
+
+import logging
+import os
+
+from PyQt5.QtCore import QObject, QRect, QThread, pyqtSignal
+from PyQt5.QtGui import QImageReader, QPixmap
+from PyQt5.QtWidgets import QApplication
+
+from ui import card_pixmap
+from ui.card_atlas import (
+    ATLAS_IMAGE_PATH,
+    CARD_BACK_PREFIX,
+    CARD_IMAGE_DIR,
+    WILD_SUFFIX,
+    add_wild_border,
+    load_atlas_index,
+    source_images,
+    wild_id,
+)
+from ui.scaled_card_cache import default_scaled_cache
+
+# Images per batch sent to the GUI thread; each batch is a few milliseconds
+# of QPixmap conversion, short enough to keep the windows responsive.
+PRELOAD_BATCH_SIZE = 8
+
+
+def source_key(image_id):
+    """The source_pixmap_cache key for an atlas image id, or None if unused."""
+    if image_id == card_pixmap.CARD_BACK_ID:
+        return (image_id, False, False, None)
+    if image_id.startswith(CARD_BACK_PREFIX):
+        return None  # Alternative card backs are never shown.
+    if image_id.endswith(WILD_SUFFIX):
+        return (image_id[: -len(WILD_SUFFIX)], True, True, None)
+    return (image_id, True, False, None)
+
+
+def read_image(path):
+    reader = QImageReader(path)
+    image = reader.read()
+    if image.isNull():
+        logging.warning(
+            f"Card preloader: could not read {path}: {reader.errorString()}"
+        )
+    return image
+
+
+class CardImageLoader(QObject):
+    """Decodes card images on the worker thread. Never touches QPixmap."""
+
+    batch_ready = pyqtSignal(list)  # [(cache key, QImage), ...]
+    finished = pyqtSignal()
+
+    def __init__(self, scaled_cache=None):
+        super().__init__()
+        self.scaled_cache = scaled_cache
+
+    def run(self):
+        try:
+            batch = []
+            for image_id, image in self.images():
+                key = source_key(image_id)
+                if key is None or image.isNull():
+                    continue
+                batch.append((key, image))
+                if len(batch) == PRELOAD_BATCH_SIZE:
+                    self.batch_ready.emit(batch)
+                    batch = []
+            if batch:
+                self.batch_ready.emit(batch)
+            if self.scaled_cache is not None:
+                written = self.scaled_cache.build([card_pixmap.CARD_SIZE])
+                if written:
+                    logging.info(f"Card preloader: wrote {written} scaled images.")
+        except Exception as e:
+            logging.error(f"Card preloader failed: {e}")
+        self.finished.emit()
+
+    def images(self):
+        """Yield (image id, QImage) for every card image."""
+        try:
+            index = load_atlas_index()
+        except OSError as e:
+            logging.warning(f"Card preloader: no atlas, reading card files: {e}")
+            yield from self.file_images()
+            return
+        atlas = read_image(
+            os.path.join(os.path.dirname(ATLAS_IMAGE_PATH), index["image"])
+        )
+        if atlas.isNull():
+            yield from self.file_images()
+            return
+        for image_id, rect in index["cells"].items():
+            yield image_id, atlas.copy(QRect(*rect))
+
+    def file_images(self):
+        for card_id, (path, _, _) in source_images(CARD_IMAGE_DIR).items():
+            image = read_image(path)
+            yield card_id, image
+            if not image.isNull() and not card_id.startswith(CARD_BACK_PREFIX):
+                wild_image = image.copy()
+                add_wild_border(wild_image)
+                yield wild_id(card_id), wild_image
+
+
+class CardPreloader(QObject):
+    """Runs a CardImageLoader on its own QThread and collects its results."""
+
+    finished = pyqtSignal()
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.worker_thread = QThread()
+        # Created here, on the GUI thread, so both threads share one instance.
+        self.loader = CardImageLoader(default_scaled_cache())
+        self.loader.moveToThread(self.worker_thread)
+        self.worker_thread.started.connect(self.loader.run)
+        self.loader.batch_ready.connect(self.add_batch)
+        self.loader.finished.connect(self.on_loader_finished)
+        self.loaded = 0
+
+    def start(self):
+        card_pixmap.preloading = True
+        self.worker_thread.start()
+
+    def add_batch(self, batch):
+        for key, image in batch:
+            card_pixmap.source_pixmap_cache.put(key, QPixmap.fromImage(image))
+        self.loaded += len(batch)
+
+    def on_loader_finished(self):
+        self.worker_thread.quit()
+        self.worker_thread.wait()
+        card_pixmap.preloading = False
+        logging.info(f"Card preloader: {self.loaded} images ready.")
+        repaint_card_widgets()
+        self.finished.emit()
+
+
+def repaint_card_widgets():
+    """Swap every placeholder (and any other card image) for the real one."""
+    from ui.card_widget import CardWidget
+
+    for widget in QApplication.allWidgets():
+        if isinstance(widget, CardWidget):
+            widget.update_card_image()
+
+
+_preloader = None
+
+
+def start_card_preloader():
+    """Start decoding the card images in the background, once per process."""
+    global _preloader
+    if _preloader is None:
+        _preloader = CardPreloader()
+        _preloader.start()
+    return _preloader
@@ -1,9 +1,10 @@
-import json
 import logging
 from PyQt5.QtWidgets import QApplication, QLabel, QSizePolicy
 from PyQt5.QtCore import Qt, QMimeData
 from PyQt5.QtGui import QPixmap, QDrag
 from core.card import Card
+from core.encoding import card_message
+from ui.card_pixmap import scaled_card_pixmap
 from ui.drag_widget import DragWidget
 
 
@@ -29,12 +30,11 @@ class CardWidget(QLabel):
         self.player_dragwidget = player_dragwidget
         self.reveal_dragwidget = reveal_dragwidget
         self.parent_window = parent_window
+        # face_down is how the card was dealt and decides whether it can be
+        # dragged; face_up is how it is shown right now. Both belong to this
+        # widget, since the same Card is shown in every player's window.
         self.face_down = face_down
-
-        if face_down:
-            self.card.set_face_down()
-        else:
-            self.card.set_face_up()
+        self.face_up = not face_down
 
         # self.drag_start_position = QPoint()
         self.drag_start_position = None
@@ -47,25 +47,27 @@ class CardWidget(QLabel):
         #     f"Widget relationships: parent_dragwidget={self.player_dragwidget}, reveal_dragwidget={self.reveal_dragwidget}, parent_window={self.parent_window}"
         # )
 
+    def is_wild(self):
+        # Wild is game state: ask the owning window's WildContext.
+        wild = getattr(self.parent_window, "wild", None)
+        return wild is not None and wild.is_wild(self.card)
+
     def set_face_down(self):
-        self.card.set_face_down()
-        self.setPixmap(self.card.get_pixmap())
+        self.face_up = False
+        self.update_card_image()
 
     def set_face_up(self):
-        self.card.set_face_up()
-        self.setPixmap(self.card.get_pixmap())
+        self.face_up = True
+        self.update_card_image()
 
     def flip_card(self):
-        if self.card.face_up:
+        if self.face_up:
             self.set_face_down()
         else:
             self.set_face_up()
 
     def update_card_image(self):
-        pixmap = self.card.get_pixmap().scaled(
-            50, 80, Qt.AspectRatioMode.KeepAspectRatio
-        )
-        self.setPixmap(pixmap)
+        self.setPixmap(scaled_card_pixmap(self.card, self.face_up, self.is_wild()))
 
     def __eq__(self, other):
         if isinstance(other, CardWidget):
@@ -107,12 +109,7 @@ class CardWidget(QLabel):
 
         drag = QDrag(self)
         mime = QMimeData()
-        card_data = {
-            "value": self.card.value,
-            "suit": self.card.suit,
-            "source_name": source_widget.objectName(),
-        }
-        mime.setText(json.dumps(card_data))
+        mime.setText(card_message(self.card.code, source_widget.objectName()))
         drag.setMimeData(mime)
         pixmap = QPixmap(self.size())
         self.render(pixmap)
@@ -155,12 +152,7 @@ class CardWidget(QLabel):
 
         drag = QDrag(self)
         mime = QMimeData()
-        card_data = {
-            "value": self.card.value,
-            "suit": self.card.suit,
-            "source_name": source_widget.objectName(),
-        }
-        mime.setText(json.dumps(card_data))
+        mime.setText(card_message(self.card.code, source_widget.objectName()))
         drag.setMimeData(mime)
         pixmap = QPixmap(self.size())
         self.render(pixmap)
@@ -197,12 +189,7 @@ class CardWidget(QLabel):
 
         drag = QDrag(self)
         mime = QMimeData()
-        card_data = {
-            "value": self.card.value,
-            "suit": self.card.suit,
-            "source_name": source_widget.objectName(),
-        }
-        mime.setText(json.dumps(card_data))
+        mime.setText(card_message(self.card.code, source_widget.objectName()))
         drag.setMimeData(mime)
         pixmap = QPixmap(self.size())
         self.render(pixmap)
@@ -368,9 +355,10 @@ class CardWidget(QLabel):
             print(
                 f"Card moved to reveal area. Player has {player_hand_count} cards. Ending turn."
             )
-            self.parent_window.main_window.consecutive_passes = 0
-            if self.parent_window.main_window.call_button_clicked:
-                self.parent_window.main_window.turns_after_call += 1
+            main_window = self.parent_window.main_window
+            if not main_window.play_card_swap(self.parent_window):
+                main_window.restore_card_widgets(self.parent_window)
+                return
 
             self.parent_window.main_window.add_card_to_all_reveal_dragwidgets(
                 self.card, exclude_widget=self.parent_window.reveal_dragwidget
@@ -396,11 +384,11 @@ class CardWidget(QLabel):
 
     def init_ui(self):
         # UI initialization for CardWidget
-        self.setPixmap(self.card.get_pixmap().scaled(50, 80, Qt.KeepAspectRatio))
+        self.setPixmap(scaled_card_pixmap(self.card, self.face_up, self.is_wild()))
         self.setFixedSize(50, 80)  # Adjust size as needed
         self.setSizePolicy(QSizePolicy.Fixed, QSizePolicy.Fixed)
         self.setScaledContents(True)
 
     def set_data(self, card):
         self.card = card
-        self.setPixmap(self.card.pixmap)
+        self.update_card_image()
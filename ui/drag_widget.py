@@ -1,14 +1,15 @@
-import json
 import logging
 import traceback
 from PyQt5.QtWidgets import QWidget, QHBoxLayout, QVBoxLayout
 from PyQt5.QtCore import Qt, pyqtSignal
-from core.card import Card
+from core.card import card_for_code
+from core.encoding import read_card_message
 
 
 class DragWidget(QWidget):
     orderChanged = pyqtSignal(list)
     cardDropped = pyqtSignal(dict)
+    handChanged = pyqtSignal()  # Emitted when hand_state gains or loses a card
 
     def __init__(
         self,
@@ -49,6 +50,7 @@ class DragWidget(QWidget):
         self.setLayout(self.layout)
         self.layout.setContentsMargins(0, 0, 0, 0)
         self.cards_face_up = False
+        self.hand_state = None  # Optional HandState kept in sync with self.items
 
     def dragEnterEvent(self, event):
         if event.mimeData().hasText():
@@ -327,14 +329,15 @@ class DragWidget(QWidget):
             data = event.mimeData().text()
             print(f"Rearrangement data: {data}")
             logging.debug("Rearranging player cards.")
-            card_data = json.loads(data)
-            logging.debug(f"Dragged card: {card_data}")
-            dragged_card = Card(card_data["value"], card_data["suit"])
+            code, source_name = read_card_message(data)
+            # The interned card, so a drag builds no Card objects.
+            dragged_card = card_for_code(code)
+            logging.debug(f"Dragged card: {dragged_card} from {source_name}")
 
             dragged_card_index = None
             for i, card in enumerate(self.items):
                 logging.debug(f"Card {i}: {card.card.value} of {card.card.suit}")
-                if card.card.value == dragged_card.value:
+                if card.card is dragged_card:
                     dragged_card_index = i
                     break
 
@@ -384,14 +387,14 @@ class DragWidget(QWidget):
             data = event.mimeData().text()
             print(f"Rearrangement data: {data}")
             logging.debug("Rearranging player cards.")
-            card_data = json.loads(data)
-            logging.debug(f"Dragged card: {card_data}")
-            dragged_card = Card(card_data["value"], card_data["suit"])
+            code, source_name = read_card_message(data)
+            dragged_card = card_for_code(code)
+            logging.debug(f"Dragged card: {dragged_card} from {source_name}")
 
             dragged_card_index = None
             for i, card in enumerate(self.items):
                 logging.debug(f"Card {i}: {card.card.value} of {card.card.suit}")
-                if card.card.value == dragged_card.value:
+                if card.card is dragged_card:
                     dragged_card_index = i
                     break
 
@@ -440,6 +443,7 @@ class DragWidget(QWidget):
         if len(self.items) < self.max_items:
             self.items.append(item)
             self.layout.addWidget(item)
+            self.track_card_added(item)
             # print(f"add_item dw - Total items: {len(self.items)}")
         else:
             # print(f"Cannot add more items, max limit ({self.max_items}) reached.")
@@ -450,6 +454,7 @@ class DragWidget(QWidget):
             self.items.remove(item)
             self.layout.removeWidget(item)
             item.setParent(None)
+            self.track_card_removed(item)
         else:
             print("Item not found in DragWidget.")
 
@@ -494,6 +499,7 @@ class DragWidget(QWidget):
             if widget is not None:
                 self.items.remove(widget)
                 widget.setParent(None)
+                self.track_card_removed(widget)
 
     def minimum_cards(self):
         return self.min_items
@@ -507,10 +513,22 @@ class DragWidget(QWidget):
     def addWidget(self, widget):
         self.layout.addWidget(widget)
         self.items.append(widget)
+        self.track_card_added(widget)
 
     def insertWidget(self, index, widget):
         self.layout.insertWidget(index, widget)
         self.items.insert(index, widget)
+        self.track_card_added(widget)
+
+    def track_card_added(self, item):
+        if self.hand_state is not None:
+            self.hand_state.add(item.card)
+            self.handChanged.emit()
+
+    def track_card_removed(self, item):
+        if self.hand_state is not None:
+            self.hand_state.remove(item.card)
+            self.handChanged.emit()
 
     # CODE BELOW SEEMS TO BE DOING NOTHING - Chips ADDED BLOCK CODE FROM 18.40 =================
 
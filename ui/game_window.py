@@ -8,6 +8,7 @@ from PyQt5.QtWidgets import (
     QMessageBox,
     QDockWidget,
     QListWidget,
+    QComboBox,
     QListWidgetItem,
     QVBoxLayout,
     QHBoxLayout,
@@ -15,16 +16,35 @@ from PyQt5.QtWidgets import (
     QLineEdit,
     QPushButton,
 )
-from PyQt5.QtCore import Qt
+from PyQt5.QtCore import Qt, QTimer
 from PyQt5.QtGui import QIcon, QPixmap
 
 # Import all our new modules
+from core.bots import BOTS, DEFAULT_BUDGET, TimedBot, observe
 from core.card import Deck
 from core.dealer import Dealer
+from core.game import (
+    DECLINE_SIDE_CHIP_ACTION,
+    GAME_OVER,
+    PASS_ACTION,
+    PLAYING,
+    SIDE_CHIP,
+    SWAP,
+    TAKE_SIDE_CHIP_ACTION,
+    Action,
+    ViudaGame,
+)
+from core.wild import WildContext
+from ui.card_pixmap import highlight_wild_card
 from ui.card_widget import CardWidget
 from ui.drag_widget import DragWidget
 from ui.player_window import PlayerWindow
 
+# Pause before a bot seat plays, so its moves can be followed on screen.
+BOT_TURN_DELAY_MS = 500
+BOT_POLL_MS = 10  # How often the windows check on a bot that is thinking
+HUMAN_PLAYER = "Human"
+
 
 class Flop:
     def __init__(self):
@@ -38,7 +58,15 @@ class Flop:
 
 
 class GameWindow(QMainWindow):
-    def __init__(self, app, num_players, player_names, parent=None):
+    def __init__(
+        self,
+        app,
+        num_players,
+        player_names,
+        bots=None,
+        bot_budget=DEFAULT_BUDGET,
+        parent=None,
+    ):
         super().__init__(parent)
         self.app = app
         self.num_players = num_players
@@ -51,7 +79,12 @@ class GameWindow(QMainWindow):
         self.reveal_dragwidgets = []
         self.players = []
         self.player_index = 0
-        self.deck = Deck()
+        # Wild card value shared by the deck, dealer and every card widget.
+        self.wild = WildContext()
+        # Always a single deck: the card widgets find a dealt card by
+        # identity (PlayerWindow.swap_cards, DragWidget.rearrange_player_cards),
+        # which is ambiguous once a shoe can deal the same interned card twice.
+        self.deck = Deck(self.wild)
 
         self.player_statuses = [
             "Active" for _ in range(num_players)
@@ -69,8 +102,15 @@ class GameWindow(QMainWindow):
         self.table_chip_label = QLabel(self)
         self.side_chip_label = QLabel(self)
 
-        self.table_chips = 1  # Start with one chip on the table
-        self.side_chips = 1  # Two chips available on the side
+        # The rules engine. It holds every chip count (see table_chips,
+        # side_chips and PlayerWindow.player_chips); the turn counters
+        # below mirror its state for the UI.
+        self.game = ViudaGame(
+            num_players,
+            table_chips=1,  # Start with one chip on the table
+            side_chips=1,
+            deck=self.deck,
+        )
 
         # Pass self (GameWindow instance) to Dealer along with the other required arguments
         self.dealer = Dealer(
@@ -84,6 +124,14 @@ class GameWindow(QMainWindow):
             self.deck,
         )
 
+        # Seat -> TimedBot for the seats played by core.bots strategies.
+        # Threaded, so a stuck bot cannot freeze the windows past its budget.
+        self.bots = {
+            seat: TimedBot(bot, bot_budget, threaded=True)
+            for seat, bot in (bots or {}).items()
+        }
+        self.bot_turn_pending = False
+
         self.calling_player_number = None
 
         self.current_player_number = 1
@@ -100,12 +148,34 @@ class GameWindow(QMainWindow):
         self.is_game_over = False
         self.init_ui()
         self.init_ui_chips_and_list()
+        self.wild.add_listener(self.on_wild_card_changed)
 
         # Connect signals from Dealer to update GUI
         self.dealer.table_chip_label_updated.connect(self.update_table_chip_label)
         self.dealer.side_chip_label_updated.connect(self.update_side_chip_label)
         self.dealer.player_chips_updated.connect(self.update_player_chips_label)
 
+    @property
+    def table_chips(self):
+        return self.game.table_chips
+
+    @property
+    def side_chips(self):
+        return self.game.side_chips
+
+    def update_chip_labels(self):
+        """Show the engine's chip counts after it has moved chips."""
+        self.update_table_chip_label()
+        self.update_side_chip_label()
+        if self.side_chips == 0:
+            self.remove_side_chip_label()
+        for window in self.player_windows:
+            window.update_chips_label()
+
+    def on_wild_card_changed(self, old_value, new_value):
+        for player_window in self.player_windows:
+            player_window.on_wild_card_changed(old_value, new_value)
+
     def init_ui_chips_and_list(self):
         """Initialize the UI for chips labels and player list dock without icons."""
         window_width = 100
@@ -248,27 +318,10 @@ class GameWindow(QMainWindow):
             )
         # --- END OF CHANGES ---
 
-        # (Your wild card highlighting logic remains unchanged)
-        for card in self.all_reveal_cards:
-            if card.is_wild:
-                logging.debug(
-                    "5-6 start_first_hand - Card {} is wild and should be highlighted.".format(
-                        str(card)
-                    )
-                )
-                for player_window in self.player_windows:
-                    for card_widget in player_window.reveal_dragwidget.children():
-                        if hasattr(card_widget, "card") and card_widget.card == card:
-                            card_widget.setStyleSheet("border: 2px solid red;")
-
     # In GameWindow class (ui/game_window.py)
     def start_first_hand(self):
         self.hand_in_progress = True
-        self.deck.shuffle()
-        self.deck.update_wild_card(self.table_chips)
-
-        self.all_reveal_cards = self.deck.deal(5)
-        self.all_player_cards = [self.deck.deal(5) for _ in range(self.num_players)]
+        self.deal_from_game()
 
         for i, player_window in enumerate(self.player_windows):
             player_window.add_cards_to_widget(
@@ -280,12 +333,8 @@ class GameWindow(QMainWindow):
                 reveal=False,
             )
 
-        # --- UNIFIED STARTER LOGIC (same as next_hand) ---
-        # The "next" starter after the pre-game state (0) is Player 1.
-        self.hand_starter_number = (self.hand_starter_number % self.num_players) + 1
-        self.current_player_number = self.hand_starter_number
+        # The engine starts the first hand with Player 1.
         print(f"--- FIRST HAND --- Player {self.current_player_number} will start.")
-        # --- END OF UNIFIED LOGIC ---
 
         # Set button states for all players based on the starter.
         for player_window in self.player_windows:
@@ -293,19 +342,6 @@ class GameWindow(QMainWindow):
                 self.current_player_number, call_button_clicked=False
             )
 
-        # (Your wild card highlighting logic remains unchanged)
-        for card in self.all_reveal_cards:
-            if card.is_wild:
-                logging.debug(
-                    f"start_first_hand: Card {card} is wild and should be highlighted."
-                )
-                for player_window in self.player_windows:
-                    for card_widget in player_window.reveal_dragwidget.findChildren(
-                        CardWidget
-                    ):
-                        if hasattr(card_widget, "card") and card_widget.card == card:
-                            card_widget.setStyleSheet("border: 2px solid red;")
-
     # In GameWindow class
     def check_end_hand1(self):
         try:
@@ -347,48 +383,169 @@ class GameWindow(QMainWindow):
 
     # In GameWindow class
     def check_end_hand(self):
-        try:
-            active_players = [
-                p
-                for p in self.player_windows
-                if self.player_statuses[p.player_index] == "Active"
-            ]
-            num_active_players = len(active_players)
+        # ViudaGame ends the hand as soon as the last action of it is applied
+        # (everyone passed, or a full round after a call); this only catches up.
+        if self.hand_in_progress and self.game.phase != PLAYING:
+            print("check_end_hand - The hand is over. Ending hand.")
+            self.end_hand()
 
-            # Pass Button Strict Rule Check
-            if self.consecutive_passes >= num_active_players and num_active_players > 1:
-                print("check_end_hand - All active players passed. Ending hand.")
-                self.end_hand()
-                return
+    def play_action(self, action):
+        """
+        Apply the current player's action to the rules engine and copy its
+        turn state back. Returns False, changing nothing, if the engine
+        does not allow the action right now.
+        """
+        if not self.game.is_legal(action):
+            logging.warning(f"play_action: {action} is not allowed now.")
+            return False
+        self.game.apply(action)
+        self.sync_turn_state()
+        return True
+
+    def play_card_swap(self, player_window):
+        """
+        Play the drag swap the player just finished in their widgets: the
+        one card that left their hand for the one that came in. Returning
+        the card they took counts as a pass.
+        """
+        seat = player_window.player_index
+        hand = self.game.hands[seat]
+        dealt = set(hand)
+        held = [card_label.card for card_label in player_window.player_dragwidget.items]
+        given = [card for card in hand if card not in held]
+        taken = [card for card in held if card not in dealt]
+        if not given and not taken:
+            return self.play_action(PASS_ACTION)
+        if len(given) != 1 or len(taken) != 1:
+            logging.warning(
+                f"play_card_swap: {player_window.player_name} moved {len(taken)} cards in."
+            )
+            return False
+        action = Action(
+            SWAP,
+            hand.index(given[0]),
+            self.game.reveal_cards.index(taken[0]),
+        )
+        return self.play_action(action)
 
-            # Call Button Logic Check
-            if self.call_button_clicked:
-                # --- THE FIX: The counter is now managed ONLY here ---
-                # The check happens *before* we decide to increment.
-                print(
-                    f"check_end_hand - Turns after call: {self.turns_after_call}/{num_active_players}"
+    def restore_card_widgets(self, player_window):
+        """
+        Move the player's card widgets back to where the engine has the
+        cards, after it rejected the swap they dragged.
+        """
+        hand = set(self.game.hands[player_window.player_index])
+        player_widget = player_window.player_dragwidget
+        reveal_widget = player_window.reveal_dragwidget
+        # Hand cards first: the reveal widget has no room until they leave.
+        misplaced = [
+            (card_label, reveal_widget, player_widget)
+            for card_label in reveal_widget.items
+            if card_label.card in hand
+        ] + [
+            (card_label, player_widget, reveal_widget)
+            for card_label in player_widget.items
+            if card_label.card not in hand
+        ]
+        for card_label, source, target in misplaced:
+            source.remove_item(card_label)
+            target.add_item(card_label)
+            card_label.setParent(target)
+            card_label.show()
+        # Taking a reveal card also took it off every other window.
+        for card in self.game.reveal_cards:
+            if any(
+                all(item.card is not card for item in window.reveal_dragwidget.items)
+                for window in self.player_windows
+            ):
+                self.add_card_to_all_reveal_dragwidgets(
+                    card, exclude_widget=reveal_widget
                 )
-                if self.turns_after_call >= num_active_players:
-                    print("check_end_hand - Final round is over. Ending hand.")
-                    self.end_hand()
-                    return
 
-                # If the hand is not over, we can safely increment for the next check.
-                # This logic needs to be tied to a turn actually passing.
-                # Let's add a flag. In every action method (pass, reveal, etc.) set a flag:
-                # self.main_window.turn_action_taken = True
-                # And in next_hand, reset it: self.turn_action_taken = False
+    def sync_turn_state(self):
+        game = self.game
+        self.consecutive_passes = game.consecutive_passes
+        self.call_button_clicked = game.call_made
+        self.turns_after_call = game.turns_after_call
+        if game.calling_player is not None:
+            self.calling_player_number = game.calling_player + 1
+        if game.current_player is not None:
+            self.current_player_number = game.current_player + 1
+        if (
+            game.phase == PLAYING
+            and game.current_player in self.bots
+            and not self.bot_turn_pending
+        ):
+            self.bot_turn_pending = True
+            QTimer.singleShot(BOT_TURN_DELAY_MS, self.play_bot_turn)
+
+    def play_bot_turn(self):
+        """Let the bot in the current seat play its turn through its window."""
+        game = self.game
+        seat = game.current_player
+        runner = self.bots.get(seat)
+        if not self.hand_in_progress or game.phase != PLAYING or runner is None:
+            self.bot_turn_pending = False
+            return
+
+        def play(decision):
+            self.bot_turn_pending = False
+            # The windows may have moved on while the bot was thinking.
+            if (
+                not self.hand_in_progress
+                or game.phase != PLAYING
+                or game.current_player != seat
+            ):
+                return
+            if decision.timed_out:
+                logging.warning(
+                    f"Bot {runner.name} ran out of time; playing {decision.action.kind}."
+                )
+            self.player_windows[seat].play_action(decision.action)
+
+        self.request_bot_decision(runner, play)
 
-                # No, that is too complex. Let's simplify.
-                # The problem is that check_end_hand is called multiple times.
-                # The increment needs to be tied to the turn change itself.
-                pass  # We will put the increment in the turn change functions.
+    def request_bot_decision(self, runner, on_decision):
+        """
+        Start runner (a threaded TimedBot) on the current decision and call
+        on_decision(decision) from the event loop once it has answered or
+        run out of time, so the windows stay responsive while it thinks.
+        """
+        pending = runner.submit(observe(self.game))
 
-        except Exception as e:
-            print(f"An error occurred in check_end_hand: {e}")
-            import traceback
+        def poll():
+            if pending.ready():
+                on_decision(pending.result())
+            else:
+                QTimer.singleShot(BOT_POLL_MS, poll)
 
-            traceback.print_exc()
+        poll()
+
+    def resolve_side_chip(self, loser, choice):
+        """Apply the loser's side chip choice ("Yes" or "No") and move on."""
+        loser_index = loser.player_index
+        if choice == "Yes":
+            self.play_action(TAKE_SIDE_CHIP_ACTION)
+            self.update_chip_labels()
+            print(
+                f"{loser.player_name} took the last side chip. Player chips now: {loser.player_chips}"
+            )
+        else:
+            print(f"{loser.player_name} declined the last side chip.")
+            self.play_action(DECLINE_SIDE_CHIP_ACTION)
+            # remove_player_from_game moves the game on by itself.
+            self.remove_player_from_game(loser)
+            return
+
+        self.clear_previous_qmessage()
+        self.dealer.check_for_game_continuation()
+
+    def deal_from_game(self):
+        """Start the engine's next hand and take its cards and starter."""
+        self.game.start_hand()
+        self.sync_turn_state()
+        self.hand_starter_number = self.game.hand_starter + 1
+        self.all_reveal_cards = list(self.game.reveal_cards)
+        self.all_player_cards = [list(hand) for hand in self.game.hands]
 
     def end_hand(self):
         try:
@@ -417,20 +574,16 @@ class GameWindow(QMainWindow):
                 window.pass_button.setEnabled(False)
                 window.pass_button.setStyleSheet("background-color: yellow;")
 
-            # (The rest of your method's logic from here is correct and remains unchanged)
-            active_player_windows = [
-                p
-                for p in self.player_windows
-                if self.player_statuses[p.player_index] == "Active"
-            ]
-            winning_window, losing_window, winning_cards = (
-                self.dealer.determine_winner_and_loser(active_player_windows)
-            )
+            # The engine has already settled the hand (ViudaGame.end_hand).
+            result = self.game.last_result
+            winning_window = self.player_windows[result.winner]
+            losing_window = self.player_windows[result.loser]
+            winning_cards = self.game.hands[result.winner]
 
             for card in winning_cards:
                 card_label = winning_window.find_card_label(card)
                 if card_label:
-                    card.highlight_wild_card(card_label, is_face_up=True)
+                    highlight_wild_card(card_label, is_face_up=True)
 
             self.last_loser_number = losing_window.player_number
             loser = losing_window
@@ -440,30 +593,29 @@ class GameWindow(QMainWindow):
             print(f"Loser: {loser.player_name}")
             self.dealer.display_winner(winning_window)
 
-            self.dealer.update_player_chips(loser_index, -1)
+            self.update_chip_labels()
             print(f"Updated player chips for {loser.player_name}: {loser.player_chips}")
-            self.table_chips += 1
-            self.update_table_chip_label(self.table_chips)
 
-            if loser.player_chips <= 0:
-                if not self.side_chip_label.isVisible():
-                    print(
-                        f"Player {loser.player_name} has no chips left and no side chips available. Removing player."
-                    )
-                    self.remove_player_from_game(loser)
-                    return
-                choice = self.ask_loser_to_take_side_chip(loser)
-                if choice == "Yes":
-                    self.dealer.update_side_chips(-1, self)
-                    self.dealer.update_player_chips(loser_index, 1)
-                    print(
-                        f"{loser.player_name} took the last side chip. Player chips now: {loser.player_chips}"
-                    )
-                    if self.dealer.side_chips == 0:
-                        self.remove_side_chip_label()
+            if result.eliminated == loser_index:
+                print(
+                    f"Player {loser.player_name} has no chips left and no side chips available. Removing player."
+                )
+                self.remove_player_from_game(loser)
+                return
+            if self.game.phase == SIDE_CHIP:
+                runner = self.bots.get(loser_index)
+                if runner is None:
+                    choice = self.ask_loser_to_take_side_chip(loser)
+                    self.resolve_side_chip(loser, choice)
                 else:
-                    print(f"{loser.player_name} declined the last side chip.")
-                    self.remove_player_from_game(loser)
+                    self.request_bot_decision(
+                        runner,
+                        lambda decision: self.resolve_side_chip(
+                            loser,
+                            "Yes" if decision.action == TAKE_SIDE_CHIP_ACTION else "No",
+                        ),
+                    )
+                return
 
             self.clear_previous_qmessage()
             self.dealer.check_for_game_continuation()
@@ -485,8 +637,8 @@ class GameWindow(QMainWindow):
     def update_side_chip_label(self):
         """Update the side chips label in the GameWindow."""
         if hasattr(self, "side_chip_label"):
-            self.side_chip_label.setText(f"Side Chips: {self.dealer.side_chips}")
-            print(f"Updated side chip label to {self.dealer.side_chips}")
+            self.side_chip_label.setText(f"Side Chips: {self.side_chips}")
+            print(f"Updated side chip label to {self.side_chips}")
 
     def remove_side_chip_label(self):
         """Hides the side_chip_label from the GUI when no side chips are left."""
@@ -516,9 +668,8 @@ class GameWindow(QMainWindow):
         # 2. Close the player's window to remove it from the screen.
         loser_window.close()
 
-        # 3. Mark the player as having 0 chips to make them inactive for game logic.
-        #    (This is already done by the dealer, but we ensure it here).
-        loser_window.player_chips = 0
+        # 3. Show the 0 chips the engine left them with.
+        self.update_chip_labels()
 
         # NOTE: We NO LONGER remove the player from self.player_windows.
         # They stay in the list forever but with an 'Out' status.
@@ -572,9 +723,7 @@ class GameWindow(QMainWindow):
             print(f"Error in update_player_status: {e}")
 
     def update_table_chip_label(self, table_chips=None):
-        """Updates the table chip label in the GameWindow."""
-        if table_chips is not None:
-            self.table_chips = table_chips
+        """Updates the table chip label in the GameWindow from the engine."""
         self.table_chip_label.setText(f"Table Chips: {self.table_chips}")
 
     # Gemini
@@ -592,61 +741,18 @@ class GameWindow(QMainWindow):
                 if window.reveal_button.isHidden():
                     window.reveal_button.show()
 
-            # --- FINAL, ROBUST STARTING PLAYER LOGIC ---
-            found_starter = False
-            # Loop a maximum of num_players times to find the next active starter in the rotation.
-            for _ in range(self.num_players):
-                # Calculate the next player number in the original sequence (1->2->3->1...).
-                self.hand_starter_number = (
-                    self.hand_starter_number % self.num_players
-                ) + 1
-
-                # Find the window for this candidate.
-                starter_window = next(
-                    (
-                        p
-                        for p in self.player_windows
-                        if p.player_number == self.hand_starter_number
-                    ),
-                    None,
-                )
-
-                # Check if this designated starter is active.
-                if (
-                    starter_window
-                    and self.player_statuses[starter_window.player_index] == "Active"
-                ):
-                    # We found an active player who is next in the rotation. This is our starter.
-                    self.current_player_number = starter_window.player_number
-                    print(
-                        f"--- NEW HAND --- Player {self.current_player_number} will start."
-                    )
-                    found_starter = True
-                    break  # Exit the loop, we have our starter.
-
-            if not found_starter:
+            if self.game.phase == GAME_OVER:
                 # This should only happen when 1 or 0 players are left.
                 print(
-                    "next_hand: Could not find a suitable active starter. Checking for game end."
+                    "next_hand: No players left to start a hand. Checking for game end."
                 )
                 self.dealer.check_for_game_continuation()
                 return
-            # --- END OF FINAL LOGIC ---
 
-            # (Wild Card and Card Dealing logic is now correct)
-            self.deck.update_wild_card(self.table_chips)
-            active_player_count = len(
-                [s for s in self.player_statuses if s == "Active"]
-            )
-            required_cards = (active_player_count * 5) + 5
-            if len(self.deck.cards) < required_cards:
-                print("Not enough cards in deck. Creating new deck.")
-                self.deck = Deck()
-                self.deck.update_wild_card(self.table_chips)
-                self.deck.shuffle()
-
-            self.all_reveal_cards = self.deck.deal(5)
-            self.all_player_cards = [self.deck.deal(5) for _ in range(self.num_players)]
+            # The engine moves the start to the next active player, updates the
+            # wild card from the table chips and deals the active seats.
+            self.deal_from_game()
+            print(f"--- NEW HAND --- Player {self.current_player_number} will start.")
 
             for i, player_window in enumerate(self.player_windows):
                 player_window.player_dragwidget.clear()
@@ -750,11 +856,8 @@ class GameWindow(QMainWindow):
             required_cards = (active_player_count * 5) + 5
 
             # Only recreate deck if we don't have enough cards
-            if len(self.deck.cards) < required_cards:
-                print("Not enough cards in deck. Creating new deck.")
-                self.deck = Deck()
-                # Also update wild card for the new deck (redundant but safe)
-                self.deck.update_wild_card(self.table_chips)
+            if self.deck.remaining_cards() < required_cards:
+                print("Not enough cards in deck. Reshuffling the deck.")
                 self.deck.shuffle()
 
             self.all_reveal_cards = self.deck.deal(5)
@@ -858,6 +961,8 @@ class GameWindow(QMainWindow):
             QApplication.quit()
 
     def closeEvent(self, event):
+        for runner in self.bots.values():
+            runner.close()
         self.final_end_game()
 
     def only_one_player_with_chips(self):
@@ -910,14 +1015,12 @@ class GameWindow(QMainWindow):
         )
 
     def update_table_chip_label(self, table_chips=None):
-        if table_chips is not None:
-            self.table_chips = table_chips
         self.table_chip_label.setText(f"Table Chips: {self.table_chips}")
 
     def update_player_chips_label(self, player_index, chips):
         # print(f"Updating player chips label for player index: {player_index} with chips: {chips}")
         if 0 <= player_index < len(self.player_windows):
-            self.player_windows[player_index].update_chips_label(chips)
+            self.player_windows[player_index].update_chips_label()
         else:
             print(f"Invalid player index: {player_index} for updating chips label.")
 
@@ -1111,14 +1214,20 @@ class PlayerNamesDialog(QDialog):
         self.layout = QVBoxLayout(self)
 
         self.inputs = []
+        self.bot_choices = []
+        self.bot_names = {}  # Seat -> core.bots name, for seats played by a bot
         for i in range(num_players):
             h_layout = QHBoxLayout()
             label = QLabel(f"Player {i + 1} Name:")
             line_edit = QLineEdit()
+            bot_choice = QComboBox()
+            bot_choice.addItems([HUMAN_PLAYER, *BOTS])
             h_layout.addWidget(label)
             h_layout.addWidget(line_edit)
+            h_layout.addWidget(bot_choice)
             self.layout.addLayout(h_layout)
             self.inputs.append(line_edit)
+            self.bot_choices.append(bot_choice)
 
         button_layout = QHBoxLayout()
         ok_button = QPushButton("OK")
@@ -1134,4 +1243,9 @@ class PlayerNamesDialog(QDialog):
             input.text() if input.text().strip() else f"GoPlayer {i + 1}"
             for i, input in enumerate(self.inputs)
         ]
+        self.bot_names = {
+            i: choice.currentText()
+            for i, choice in enumerate(self.bot_choices)
+            if choice.currentText() != HUMAN_PLAYER
+        }
         super().accept()
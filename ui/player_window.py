@@ -7,11 +7,28 @@ from PyQt5.QtWidgets import (
     QWidget,
     QSizePolicy,
     QLabel,
+    QMessageBox,
 )
 from PyQt5.QtCore import Qt, QTimer
 
 # Imports from our new modules
 from core.card import Card
+from core.evaluator import describe_score
+from core.exchange_solver import best_exchange, describe_move
+from core.game import (
+    CALL,
+    CALL_ACTION,
+    EXCHANGE,
+    EXCHANGE_ACTION,
+    PASS_ACTION,
+    REVEAL,
+    REVEAL_ACTION,
+    SWAP,
+)
+from core.hand_state import HandState
+from core.percentile import default_percentiles
+from core.wild import WildContext
+from ui.card_pixmap import highlight_wild_card
 from ui.card_widget import CardWidget
 from ui.drag_widget import DragWidget
 
@@ -65,6 +82,7 @@ class PlayerWindow(QMainWindow):
         # self.player_number = player_number
         self.parent_window = parent_window
         self.main_window = main_window
+        self.wild = main_window.wild  # The game's WildContext
         self.app = app
 
         self.player_dragwidget = player_dragwidget
@@ -88,11 +106,16 @@ class PlayerWindow(QMainWindow):
         self.items = []
         self.cards = []  #  OJOJOJOJOJOJOJO
 
-        self.player_chips = 1  # Set the initial amount of chips for each player
-
         # Initialize the UI after setting up the widgets
         self.init_ui()
 
+        # Keep a running evaluation of the player's hand for the strength label
+        self.player_dragwidget.hand_state = HandState(
+            (item.card for item in self.player_dragwidget.items),
+            wild_card_value=self.wild.value,
+        )
+        self.player_dragwidget.handChanged.connect(self.update_hand_strength_label)
+
         self.player_dragwidget.cardDropped.connect(self.on_card_dropped)
 
         # Check if signal-slot connection for reveal_cards button exists and disconnect if needed
@@ -109,8 +132,8 @@ class PlayerWindow(QMainWindow):
             self.reveal_button.setEnabled(False)
             self.reveal_button.setStyleSheet("background-color: red;")
 
-        # Ensure reveal_cards is initialized as an empty list
-        self.reveal_cards = []
+        # The reveal cards as last shown; reveal_cards() is the button's slot.
+        self.reveal_hand = []
 
         # Ensure player_dragwidget is properly initialized
         if self.player_dragwidget is None or not hasattr(
@@ -176,11 +199,18 @@ class PlayerWindow(QMainWindow):
         self.pass_button.setMinimumWidth(100)
         self.pass_button.clicked.connect(self.pass_cards)
 
+        self.hint_button = QPushButton("Hint")
+        self.hint_button.setSizePolicy(QSizePolicy.Fixed, QSizePolicy.Preferred)
+        self.hint_button.setMaximumWidth(100)
+        self.hint_button.setMinimumWidth(100)
+        self.hint_button.clicked.connect(self.show_hint)
+
         layout = QHBoxLayout()
         layout.addWidget(self.reveal_button)
         layout.addWidget(self.exchange_button)
         layout.addWidget(self.call_button)
         layout.addWidget(self.pass_button)
+        layout.addWidget(self.hint_button)
 
         buttons_widget = QWidget()
         buttons_widget.setLayout(layout)
@@ -189,31 +219,73 @@ class PlayerWindow(QMainWindow):
 
         # Add chip display below buttons
         self.chips_label = QLabel(self)
-        self.update_chips_label(self.player_chips)
+        self.update_chips_label()
         layout.addWidget(self.chips_label)
 
+        # Live strength of the cards currently in the player's hand
+        self.hand_strength_label = QLabel(self)
+        layout.addWidget(self.hand_strength_label)
+
         # self.setLayout(layout)
 
         # Add the buttons dock on top of the reveal cards dock
         reveal_cards.setTitleBarWidget(buttons_dock)
 
-    def check_for_side_chip(self):
-        if self.main_window.side_chips > 0:
-            self.main_window.side_chips -= 1
-            self.chips += 1
-            self.main_window.update_side_chip_label()
-            self.chip_label.setText(f"P1 check_for_side_chip - Chips: {self.chips}")
-        else:
-            # If there are no side chips left, the player should be removed.
-            self.main_window.remove_player_from_game(self)
+    @property
+    def player_chips(self):
+        """This player's chips, as the rules engine has them."""
+        return self.main_window.game.chips[self.player_index]
 
-    def update_chips_label(self, chips):
-        self.player_chips = chips
+    def update_chips_label(self):
         self.chips_label.setText(f"P1-2 - Player Chips: {self.player_chips}")
         print(
             f"P2-2 - Updated chips label for Player {self.player_number} to {self.player_chips}"
         )
 
+    def update_hand_strength_label(self):
+        score = self.player_dragwidget.hand_state.best_score()
+        if score is None:
+            self.hand_strength_label.setText("")
+            return
+
+        text = describe_score(score)
+        if self.wild.value:
+            beats = default_percentiles().beats(score, self.wild.value)
+            text += f" (beats {100 * beats:.1f}% of hands)"
+        self.hand_strength_label.setText(text)
+
+    def on_wild_card_changed(self, old_value, new_value):
+        """Repaint only the cards whose wild state flipped, then rescore the hand."""
+        for drag_widget in (self.player_dragwidget, self.reveal_dragwidget):
+            for card_label in drag_widget.items:
+                if WildContext.flipped(card_label.card, old_value, new_value):
+                    card_label.update_card_image()
+        self.player_dragwidget.hand_state.set_wild_card_value(
+            new_value, [item.card for item in self.player_dragwidget.items]
+        )
+        self.update_hand_strength_label()
+
+    def show_hint(self):
+        """Suggest the best swap, exchange or pass against the face-up reveal cards."""
+        hand = [item.card for item in self.player_dragwidget.items]
+        reveal = [item.card for item in self.reveal_dragwidget.items]
+        if (
+            len(hand) != 5
+            or len(reveal) != 5
+            or any(item.face_down for item in self.reveal_dragwidget.items)
+        ):
+            QMessageBox.information(
+                self, "Hint", "A hint is available once the reveal cards are face up."
+            )
+            return
+
+        move = best_exchange(hand, reveal, self.wild.value)
+        QMessageBox.information(
+            self,
+            "Hint",
+            f"{describe_move(move, hand, reveal)} -> {describe_score(move.score)}",
+        )
+
     def create_card_widget(self, card):
         card_widget = CardWidget(card, parent_window=self)
         return card_widget
@@ -331,7 +403,7 @@ class PlayerWindow(QMainWindow):
             self.cards_revealed = True
 
             # ... (all the logic for getting card lists and swapping them is UNCHANGED) ...
-            self.reveal_cards = [
+            self.reveal_hand = [
                 card_label.card for card_label in self.reveal_dragwidget.items
             ]
             self.player_cards = [
@@ -340,7 +412,6 @@ class PlayerWindow(QMainWindow):
             self.player_dragwidget.clear()
             self.reveal_dragwidget.clear()
             for card in self.player_cards:
-                card.set_face_down()
                 card_label = CardWidget(
                     card,
                     self.player_dragwidget,
@@ -348,9 +419,7 @@ class PlayerWindow(QMainWindow):
                     parent_window=self,
                 )
                 self.reveal_dragwidget.add_item(card_label)
-            for card in self.reveal_cards:
-                card.set_face_up()
-                card.load_image()
+            for card in self.reveal_hand:
                 card_label = CardWidget(
                     card,
                     self.player_dragwidget,
@@ -358,7 +427,7 @@ class PlayerWindow(QMainWindow):
                     parent_window=self,
                 )
                 self.player_dragwidget.add_item(card_label)
-            self.reveal_cards = [
+            self.reveal_hand = [
                 card_label.card for card_label in self.reveal_dragwidget.items
             ]
             self.player_cards = [
@@ -384,19 +453,9 @@ class PlayerWindow(QMainWindow):
                     # This is the current player who just acted.
                     # Update their own cards to be face-up.
                     for card_label in window.reveal_dragwidget.items:
-                        card_label.card.set_face_up()
-                        card_label.card.load_image()
-                        scaled_pixmap = card_label.card.pixmap.scaled(
-                            50, 80, Qt.AspectRatioMode.KeepAspectRatio
-                        )
-                        card_label.setPixmap(scaled_pixmap)
+                        card_label.set_face_up()
                     for card_label in window.player_dragwidget.items:
-                        card_label.card.set_face_up()
-                        card_label.card.load_image()
-                        scaled_pixmap = card_label.card.pixmap.scaled(
-                            50, 80, Qt.AspectRatioMode.KeepAspectRatio
-                        )
-                        card_label.setPixmap(scaled_pixmap)
+                        card_label.set_face_up()
 
                     # Disable all their buttons as their turn is over.
                     self.exchange_button.setEnabled(False)
@@ -411,20 +470,14 @@ class PlayerWindow(QMainWindow):
                     self.set_next_player_button_states(window)
                     # Update their reveal widget with the current state.
                     window.reveal_dragwidget.clear()
-                    for card in self.reveal_cards:
+                    for card in self.reveal_hand:
                         card_label = CardWidget(
                             card,
                             window.player_dragwidget,
                             window.reveal_dragwidget,
                             parent_window=window,
                         )
-                        card_label.card.set_face_up()
-                        card_label.card.load_image()
-                        card_label.setPixmap(
-                            card_label.card.pixmap.scaled(
-                                50, 80, Qt.AspectRatioMode.KeepAspectRatio
-                            )
-                        )
+                        card_label.set_face_up()
                         window.reveal_dragwidget.add_item(card_label)
 
                 else:
@@ -438,20 +491,14 @@ class PlayerWindow(QMainWindow):
                     window.pass_button.setStyleSheet("background-color: red;")
                     # Also update their reveal widget.
                     window.reveal_dragwidget.clear()
-                    for card in self.reveal_cards:
+                    for card in self.reveal_hand:
                         card_label = CardWidget(
                             card,
                             window.player_dragwidget,
                             window.reveal_dragwidget,
                             parent_window=window,
                         )
-                        card_label.card.set_face_up()
-                        card_label.card.load_image()
-                        card_label.setPixmap(
-                            card_label.card.pixmap.scaled(
-                                50, 80, Qt.AspectRatioMode.KeepAspectRatio
-                            )
-                        )
+                        card_label.set_face_up()
                         window.reveal_dragwidget.add_item(card_label)
             # --- END OF REPLACEMENT ---
 
@@ -468,12 +515,13 @@ class PlayerWindow(QMainWindow):
             ):
                 return
 
-            self.main_window.consecutive_passes = 0
+            if not self.main_window.play_action(REVEAL_ACTION):
+                return
             print("Reveal button clicked")
             self.cards_revealed = True
 
             # All of this logic is correct for updating the card widgets
-            self.reveal_cards = [
+            self.reveal_hand = [
                 card_label.card for card_label in self.reveal_dragwidget.items
             ]
             self.player_cards = [
@@ -482,7 +530,6 @@ class PlayerWindow(QMainWindow):
             self.player_dragwidget.clear()
             self.reveal_dragwidget.clear()
             for card in self.player_cards:
-                card.set_face_down()
                 card_label = CardWidget(
                     card,
                     self.player_dragwidget,
@@ -490,9 +537,7 @@ class PlayerWindow(QMainWindow):
                     parent_window=self,
                 )
                 self.reveal_dragwidget.add_item(card_label)
-            for card in self.reveal_cards:
-                card.set_face_up()
-                card.load_image()
+            for card in self.reveal_hand:
                 card_label = CardWidget(
                     card,
                     self.player_dragwidget,
@@ -500,7 +545,7 @@ class PlayerWindow(QMainWindow):
                     parent_window=self,
                 )
                 self.player_dragwidget.add_item(card_label)
-            self.reveal_cards = [
+            self.reveal_hand = [
                 card_label.card for card_label in self.reveal_dragwidget.items
             ]
             self.player_cards = [
@@ -511,18 +556,14 @@ class PlayerWindow(QMainWindow):
             for window in self.main_window.player_windows:
                 if window != self:
                     window.reveal_dragwidget.clear()
-                    for card in self.reveal_cards:
+                    for card in self.reveal_hand:
                         card_label = CardWidget(
                             card,
                             window.player_dragwidget,
                             window.reveal_dragwidget,
                             parent_window=window,
                         )
-                        card_label.setPixmap(
-                            card_label.card.pixmap.scaled(
-                                50, 80, Qt.AspectRatioMode.KeepAspectRatio
-                            )
-                        )
+                        card_label.update_card_image()
                         window.reveal_dragwidget.add_item(card_label)
 
             # Hide the reveal button for all players for the rest of the hand
@@ -553,7 +594,7 @@ class PlayerWindow(QMainWindow):
             print("Exchange button clicked")
 
             # ... (all the logic for getting card lists and swapping them is UNCHANGED) ...
-            self.reveal_cards = [
+            self.reveal_hand = [
                 card_label.card for card_label in self.reveal_dragwidget.items
             ]
             self.player_cards = [
@@ -567,7 +608,7 @@ class PlayerWindow(QMainWindow):
                 self.reveal_dragwidget.addWidget(card_label)
             for card_label in reveal_cards_before_exchange:
                 self.player_dragwidget.addWidget(card_label)
-            self.reveal_cards = [
+            self.reveal_hand = [
                 card_label.card for card_label in self.reveal_dragwidget.items
             ]
             self.player_cards = [
@@ -576,27 +617,20 @@ class PlayerWindow(QMainWindow):
 
             # ... (all the logic for highlighting and propagating changes is UNCHANGED) ...
             for card_label in self.reveal_dragwidget.items:
-                card_label.card.highlight_wild_card(card_label, True)
+                highlight_wild_card(card_label, True)
             for card_label in self.player_dragwidget.items:
-                card_label.card.highlight_wild_card(
-                    card_label, not card_label.card.set_face_down
-                )
+                highlight_wild_card(card_label, card_label.face_up)
             for window in self.main_window.player_windows:
                 if window != self:
                     window.reveal_dragwidget.clear()
-                    for card in self.reveal_cards:
+                    for card in self.reveal_hand:
                         new_card_label = CardWidget(
                             card,
                             window.player_dragwidget,
                             window.reveal_dragwidget,
                             parent_window=self,  # Should probably be parent_window=window
                         )
-                        card.set_face_up()
-                        new_card_label.setPixmap(
-                            card.pixmap.scaled(
-                                50, 80, Qt.AspectRatioMode.KeepAspectRatio
-                            )
-                        )
+                        new_card_label.set_face_up()
                         window.reveal_dragwidget.addWidget(new_card_label)
 
             # Disable buttons for the current player
@@ -633,7 +667,8 @@ class PlayerWindow(QMainWindow):
             ):
                 return
 
-            self.main_window.consecutive_passes = 0
+            if not self.main_window.play_action(EXCHANGE_ACTION):
+                return
             print("Exchange button clicked")
 
             # All of this logic for swapping and propagating cards is correct
@@ -646,7 +681,7 @@ class PlayerWindow(QMainWindow):
             for card_label in reveal_cards_before_exchange:
                 self.player_dragwidget.addWidget(card_label)
 
-            self.reveal_cards = [
+            self.reveal_hand = [
                 card_label.card for card_label in self.reveal_dragwidget.items
             ]
             self.player_cards = [
@@ -654,28 +689,24 @@ class PlayerWindow(QMainWindow):
             ]
 
             for card_label in self.reveal_dragwidget.items:
-                card_label.card.highlight_wild_card(card_label, True)
+                highlight_wild_card(card_label, True)
 
             # NEW, CORRECTED CODE
             for card_label in self.player_dragwidget.items:
                 # A card in the player's hand is always considered "face up" for highlighting purposes.
-                card_label.card.highlight_wild_card(card_label, is_face_up=True)
+                highlight_wild_card(card_label, is_face_up=True)
 
             for window in self.main_window.player_windows:
                 if window != self:
                     window.reveal_dragwidget.clear()
-                    for card in self.reveal_cards:
+                    for card in self.reveal_hand:
                         new_card_label = CardWidget(
                             card,
                             window.player_dragwidget,
                             window.reveal_dragwidget,
                             parent_window=window,
                         )
-                        new_card_label.setPixmap(
-                            card.pixmap.scaled(
-                                50, 80, Qt.AspectRatioMode.KeepAspectRatio
-                            )
-                        )
+                        new_card_label.update_card_image()
                         window.reveal_dragwidget.addWidget(new_card_label)
 
             # --- SIMPLIFIED ENDING ---
@@ -741,8 +772,9 @@ class PlayerWindow(QMainWindow):
         if not self.main_window.hand_in_progress or not self.is_current_player_turn():
             return
 
+        if not self.main_window.play_action(PASS_ACTION):
+            return
         print(f"Player {self.player_number} clicked Pass.")
-        self.main_window.consecutive_passes += 1
         self.end_current_player_turn()  # Simply end the turn
 
     # In PlayerWindow class
@@ -759,10 +791,9 @@ class PlayerWindow(QMainWindow):
         if not self.is_current_player_turn():
             return
 
-        self.main_window.consecutive_passes = 0
-        self.main_window.call_button_clicked = True
-        self.main_window.turns_after_call = 1
-        self.main_window.calling_player_number = self.player_number
+        # Also moves current_player_number on to the next player.
+        if not self.main_window.play_action(CALL_ACTION):
+            return
 
         # --- NEW, RELIABLE LOGIC ---
         next_player_window = self.main_window.get_next_active_player(self.player_number)
@@ -798,6 +829,43 @@ class PlayerWindow(QMainWindow):
         print("\n--- call_cards method completed ---")
         QTimer.singleShot(0, lambda: self.main_window.check_end_hand())
 
+    def play_action(self, action):
+        """Play a core.game Action as if this player had clicked or dragged it."""
+        if action.kind == REVEAL:
+            self.reveal_cards()
+        elif action.kind == EXCHANGE:
+            self.exchange_cards()
+        elif action.kind == SWAP:
+            self.swap_cards(action.hand_index, action.reveal_index)
+        elif action.kind == CALL:
+            self.call_cards()
+        else:
+            self.pass_cards()
+
+    def swap_cards(self, hand_index, reveal_index):
+        """
+        Move one reveal card into the hand and one hand card out, the way
+        dropping them does; indexes are into the game's hand and reveal cards.
+        """
+        game = self.main_window.game
+        hand_card = game.hands[self.player_index][hand_index]
+        reveal_card = game.reveal_cards[reveal_index]
+        taken = next(
+            item for item in self.reveal_dragwidget.items if item.card is reveal_card
+        )
+        given = next(
+            item for item in self.player_dragwidget.items if item.card is hand_card
+        )
+        for card_label, source, target in (
+            (taken, self.reveal_dragwidget, self.player_dragwidget),
+            (given, self.player_dragwidget, self.reveal_dragwidget),
+        ):
+            source.remove_item(card_label)
+            target.add_item(card_label)
+            card_label.setParent(target)
+            card_label.show()
+            card_label.handle_card_movement()
+
     def set_initial_button_states(self, current_player_number, call_button_clicked):
         try:
             # logging.debug(
@@ -903,11 +971,7 @@ class PlayerWindow(QMainWindow):
     def end_current_player_turn(self):
         print(f"--- Player {self.player_number}'s turn is ending. ---")
 
-        # --- NEW CENTRALIZED LOGIC ---
-        # This function is now the ONLY place that increments the turn counter.
-        if self.main_window.call_button_clicked:
-            self.main_window.turns_after_call += 1
-        # --- END OF NEW LOGIC ---
+        # The turn counters were already moved on by main_window.play_action.
 
         # Disable buttons for the current player
         self.exchange_button.setEnabled(False)
@@ -947,23 +1011,14 @@ class PlayerWindow(QMainWindow):
 
     def set_cards_face_down(self, drag_widget):
         for item in drag_widget.items:
-            item.card.set_face_down()
-            item.card.load_image()
-            item.setPixmap(
-                item.card.pixmap.scaled(50, 80, Qt.AspectRatioMode.KeepAspectRatio)
-            )
+            item.set_face_down()
 
     def set_cards_face_up(self):
         if self.cards_revealed:
             print("Setting cards face up in DragWidget")
             for card_label in self.items:
-                if not card_label.card.face_up:
-                    card_label.card.face_up = True
-                    card_label.card.load_image()  # Load the image for the card
-                    scaled_pixmap = card_label.card.pixmap.scaled(
-                        50, 80, Qt.AspectRatioMode.KeepAspectRatio
-                    )
-                    card_label.setPixmap(scaled_pixmap)
+                if not card_label.face_up:
+                    card_label.set_face_up()
 
     def add_cards_to_widget1(self, widget, cards, reveal):
         try:
@@ -976,18 +1031,14 @@ class PlayerWindow(QMainWindow):
                     parent_window=self,
                 )
                 if reveal:
-                    card.set_face_down()
+                    card_label.set_face_down()
                     is_face_up = False
                 else:
-                    card.set_face_up()
+                    card_label.set_face_up()
                     is_face_up = True
-                scaled_pixmap = card.pixmap.scaled(
-                    50, 80, Qt.AspectRatioMode.KeepAspectRatio
-                )
-                card_label.setPixmap(scaled_pixmap)
 
                 # Highlight wild card
-                card.highlight_wild_card(card_label, is_face_up)
+                highlight_wild_card(card_label, is_face_up)
 
                 widget.add_item(card_label)
         except Exception as e:
@@ -1025,7 +1076,7 @@ class PlayerWindow(QMainWindow):
 
     def update_cards(self, reveal_cards, player_cards):
         try:
-            self.reveal_cards = reveal_cards[
+            self.reveal_hand = reveal_cards[
                 :5
             ]  # Ensure only the first 5 cards are used for reveal
             self.player_cards = player_cards[
@@ -1034,7 +1085,7 @@ class PlayerWindow(QMainWindow):
 
             self.reveal_dragwidget.clear()
             self.add_cards_to_widget(
-                self.reveal_dragwidget, self.reveal_cards, reveal=True
+                self.reveal_dragwidget, self.reveal_hand, reveal=True
             )
 
             self.player_dragwidget.clear()
@@ -1083,7 +1134,7 @@ class PlayerWindow(QMainWindow):
     def print_cards(self):
         # pass
         reveal_card_strings = [
-            f"{str(card.value)}{card.suit}" for card in self.reveal_cards
+            f"{str(card.value)}{card.suit}" for card in self.reveal_hand
         ]
         player_card_strings = [
             f"{str(card.value)}{card.suit}" for card in self.player_cards
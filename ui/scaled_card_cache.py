@@ -0,0 +1,169 @@
+"""
+Disk cache of card images pre-scaled to the size they are shown at.
+
+Each file holds one card image (plain or wild) scaled from the original
+PNG in graphics/cards with smooth filtering, at 1x and 2x for HiDPI
+screens. File names start with a hash of the source file's content, so
+changed art is picked up on the next run and the old files are pruned:
+
+    cache/scaled_cards/<sha1 prefix>_50x80@2x+wild.png
+
+ui.card_preloader fills in missing files on its worker thread; the GUI
+thread only ever loads the small finished images.
+"""
+
+import hashlib
+import logging
+import os
+from itertools import product
+
+from PyQt5.QtCore import Qt
+from PyQt5.QtGui import QGuiApplication, QImage, QPixmap
+
+from viuda_card_config import CACHE_DIR
+from ui.card_atlas import CARD_BACK_PREFIX, CARD_IMAGE_DIR, add_wild_border
+
+SCALED_CACHE_DIR = os.path.join(CACHE_DIR, "scaled_cards")
+SCALES = (1, 2)
+HASH_PREFIX_LENGTH = 16
+TEMP_SUFFIX = ".tmp"
+
+
+def display_scale():
+    """The cached scale that best matches the primary screen (1 or 2)."""
+    screen = QGuiApplication.primaryScreen()
+    if screen is None or screen.devicePixelRatio() <= 1:
+        return SCALES[0]
+    return SCALES[-1]
+
+
+def file_digest(path):
+    with open(path, "rb") as image_file:
+        return hashlib.sha1(image_file.read()).hexdigest()[:HASH_PREFIX_LENGTH]
+
+
+class ScaledCardCache:
+    """
+    Pre-scaled card images on disk, keyed by source content hash and size.
+
+    The sources are hashed once when the cache is created (57 small PNGs
+    take a few milliseconds), which makes the lookups safe to share with
+    the preloader thread.
+    """
+
+    def __init__(self, image_dir=CARD_IMAGE_DIR, cache_dir=SCALED_CACHE_DIR):
+        self.image_dir = image_dir
+        self.cache_dir = cache_dir
+        self.digests = {}
+        for name in sorted(os.listdir(image_dir)):
+            card_id, extension = os.path.splitext(name)
+            if extension.lower() == ".png":
+                self.digests[card_id] = file_digest(os.path.join(image_dir, name))
+
+    def path(self, card_id, is_wild, size, scale):
+        digest = self.digests.get(card_id)
+        if digest is None:
+            return None
+        width, height = size
+        suffix = "+wild" if is_wild else ""
+        name = f"{digest}_{width}x{height}@{scale}x{suffix}.png"
+        return os.path.join(self.cache_dir, name)
+
+    def contains(self, card_id, is_wild, size, scale):
+        path = self.path(card_id, is_wild, size, scale)
+        return path is not None and os.path.exists(path)
+
+    def pixmap(self, card_id, is_wild, size, scale):
+        """The cached pixmap at size (in device-independent pixels), or None."""
+        path = self.path(card_id, is_wild, size, scale)
+        if path is None or not os.path.exists(path):
+            return None
+        pixmap = QPixmap(path)
+        if pixmap.isNull():
+            return None
+        pixmap.setDevicePixelRatio(scale)
+        return pixmap
+
+    @staticmethod
+    def save(image, path):
+        """
+        Write image to path through a temporary file in the same directory,
+        so the GUI thread never loads a half-written PNG.
+        """
+        temp_path = path + TEMP_SUFFIX
+        try:
+            if image.save(temp_path, "PNG"):
+                os.replace(temp_path, path)
+                return True
+        except OSError as e:
+            logging.warning(f"Could not replace {path}: {e}")
+        try:
+            os.remove(temp_path)
+        except OSError:
+            pass
+        return False
+
+    def build(self, sizes, scales=SCALES):
+        """
+        Write every missing image for the given sizes and delete every
+        other image in the cache directory.
+
+        Uses QImage only, so it can run off the GUI thread. Returns the
+        number of files written.
+        """
+        os.makedirs(self.cache_dir, exist_ok=True)
+        wanted = set()
+        written = 0
+        for card_id in self.digests:
+            variants = [False]
+            if not card_id.startswith(CARD_BACK_PREFIX):
+                variants.append(True)
+            source = None
+            for size, scale, is_wild in product(sizes, scales, variants):
+                path = self.path(card_id, is_wild, size, scale)
+                wanted.add(os.path.basename(path))
+                if os.path.exists(path):
+                    continue
+                if source is None:
+                    source = QImage(os.path.join(self.image_dir, f"{card_id}.png"))
+                if source.isNull():
+                    continue
+                image = source.scaled(
+                    size[0] * scale,
+                    size[1] * scale,
+                    Qt.AspectRatioMode.KeepAspectRatio,
+                    Qt.TransformationMode.SmoothTransformation,
+                )
+                if is_wild:
+                    add_wild_border(image)
+                if self.save(image, path):
+                    written += 1
+                else:
+                    logging.warning(f"Could not write scaled card image {path}")
+
+        for name in os.listdir(self.cache_dir):
+            if name.endswith(TEMP_SUFFIX) or (
+                name.endswith(".png") and name not in wanted
+            ):
+                # Left over from art that has since changed, or from a
+                # run that stopped mid-write.
+                try:
+                    os.remove(os.path.join(self.cache_dir, name))
+                except OSError:
+                    pass
+        return written
+
+
+_default_scaled_cache = None
+
+
+def default_scaled_cache():
+    """Shared ScaledCardCache, or None if the card images cannot be read."""
+    global _default_scaled_cache
+    if _default_scaled_cache is None:
+        try:
+            _default_scaled_cache = ScaledCardCache()
+        except OSError as e:
+            logging.warning(f"Scaled card cache unavailable: {e}")
+            _default_scaled_cache = False
+    return _default_scaled_cache or None
@@ -23,3 +23,6 @@ VALUE_DICT = {
 REVERSE_VALUE_DICT = {v: k for k, v in VALUE_DICT.items()}
 REVERSE_VALUE_DICT[1] = "A"  # Special case: 1 should also map to Ace for wild card
 # --- END OF ADDITION ---
+
+# Precomputed tables (hand evaluation, etc.) are cached here between runs.
+CACHE_DIR = "cache"